@@ -75,36 +75,303 @@ Built with Google Cloud Agent Development Kit (ADK)
 """
 
 import asyncio
+import atexit
+import functools
+import hashlib
+import io
 import logging
+import operator
 import os
+import queue
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import Any, Dict, List, Optional
-from dataclasses import dataclass
-from datetime import datetime, UTC
+from dataclasses import dataclass, fields, is_dataclass
+from functools import cached_property
+from datetime import datetime, timedelta, UTC
 import json
-from google.cloud.logging_v2.handlers import StructuredLogHandler
 
-# Load environment variables from .env file
-from dotenv import load_dotenv
-load_dotenv()
+from .gemini_cache import PromptCache, SemanticCache, prompt_key
 
-from google.cloud import logging as cloud_logging
-from google.cloud import bigquery
-from google.cloud import secretmanager
-from google.cloud import monitoring_v3
-
-# Gemini imports with fallback
+# orjson is several times faster than the stdlib encoder; fall back if absent.
+# Output is always compact: whitespace only costs bytes and Gemini tokens.
+# Both loaders accept str or bytes.
 try:
-    from google.cloud import aiplatform
-    from vertexai.generative_models import GenerativeModel
-    GEMINI_AVAILABLE = True
+    import orjson
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    _json_loads = orjson.loads
 except ImportError:
-    GEMINI_AVAILABLE = False
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'))
+    
+    _json_loads = json.loads
+
+# Load environment variables from .env file (set PG_LOAD_DOTENV=0 to skip).
+# Skipped when the environment is already configured, which saves the disk
+# read in deployed services and test runs.
+if os.getenv("PG_LOAD_DOTENV", "1") == "1" and "GOOGLE_CLOUD_PROJECT" not in os.environ:
+    from dotenv import load_dotenv
+    load_dotenv()
+
+@dataclass(frozen=True, slots=True)
+class _Cfg:
+    """Google Cloud settings resolved once at import time."""
+    project_id: Optional[str]
+    location: str
+
+_CFG = _Cfg(
+    project_id=os.getenv('GOOGLE_CLOUD_PROJECT'),
+    location=os.getenv('GOOGLE_CLOUD_LOCATION', 'us-central1')
+)
+
+# uvloop schedules tasks and drives sockets considerably faster than the
+# default selector loop. Installed at import so every asyncio.run() in the
+# orchestrator and agents picks it up (set PG_USE_UVLOOP=0 to opt out).
+if os.getenv("PG_USE_UVLOOP", "1") == "1":
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+# google.cloud.* and vertexai pull in gRPC and protobuf descriptors, which
+# dominates cold start. They are imported on first use instead of here.
+
+@functools.lru_cache(maxsize=1)
+def _load_gemini() -> tuple:
+    """
+    Import the Vertex AI SDK once; returns (aiplatform, GenerativeModel,
+    GenerationConfig) or (None, None, None).
+    """
+    try:
+        from google.cloud import aiplatform
+        from vertexai.generative_models import GenerationConfig, GenerativeModel
+        return aiplatform, GenerativeModel, GenerationConfig
+    except ImportError:
+        return None, None, None
+
+@functools.lru_cache(maxsize=1)
+def _load_context_caching() -> tuple:
+    """
+    Import Vertex AI explicit context caching; returns (caching, GenerativeModel)
+    or (None, None).
+    
+    Both come from the preview namespace: older SDKs only expose
+    from_cached_content() on the preview GenerativeModel.
+    """
+    try:
+        from vertexai.preview import caching
+        from vertexai.preview.generative_models import GenerativeModel
+        return caching, GenerativeModel
+    except ImportError:
+        return None, None
+
+GEMINI_MODEL_NAME = "gemini-2.0-flash"
+
+@functools.lru_cache(maxsize=1)
+def _shared_gemini_model():
+    """
+    Initialize Vertex AI once and return the process-wide GenerativeModel.
+    
+    Every agent shares this model, and with it the SDK's async gRPC channel,
+    so connections and TLS sessions are reused across agents instead of each
+    agent opening its own. Failures are not cached and are retried on the
+    next call.
+    """
+    aiplatform, GenerativeModel, _ = _load_gemini()
+    aiplatform.init(project=_CFG.project_id, location=_CFG.location)
+    return GenerativeModel(GEMINI_MODEL_NAME)
+
+# Vertex AI refuses to cache prefixes shorter than this many tokens
+CONTEXT_CACHE_MIN_TOKENS = 2048
+CONTEXT_CACHE_TTL = timedelta(minutes=10)
+# Seconds to send a preamble inline after creating its cache failed
+CONTEXT_CACHE_RETRY_DELAY = 60
+# Set PG_GEMINI_CONTEXT_CACHE=0 to always send preambles inline
+CONTEXT_CACHE_ENABLED = os.getenv("PG_GEMINI_CONTEXT_CACHE", "1") == "1"
+
+# Number of recent events kept per agent for debugging and event capture
+EVENT_HISTORY_LIMIT = 1024
+
+# Upper bound on concurrent Gemini requests per event loop (Vertex AI quota)
+GEMINI_MAX_IN_FLIGHT = int(os.getenv("GEMINI_MAX_IN_FLIGHT", "32"))
+
+# Cloud Monitoring accepts at most 200 time series per create_time_series call
+METRIC_BATCH_SIZE = 200
+METRIC_MAX_LATENCY = 1.0
+# How long flush_metrics() waits for the flusher thread to write its batch
+METRIC_FLUSH_TIMEOUT = 5.0
+
+# Analytics rows are coalesced per table up to this size or latency
+BIGQUERY_BATCH_SIZE = 500
+BIGQUERY_MAX_LATENCY = 1.0
 
-# Set up structured logging for Google Cloud
-logging.basicConfig(level=logging.INFO, handlers=[StructuredLogHandler()])
+def _preamble_key(system_preamble: str) -> str:
+    """Stable short hash identifying a prompt preamble."""
+    return hashlib.blake2b(system_preamble.encode(), digest_size=16).hexdigest()
+
+@functools.lru_cache(maxsize=64)
+def _row_encoder(cls):
+    """
+    Build a JSON-safe encoder specialized for one dataclass row type.
+    
+    The field names and datetime fields are resolved once from the dataclass
+    definition, so encoding a row only converts those fields instead of
+    type-checking every attribute.
+    """
+    names = [f.name for f in fields(cls)]
+    datetime_fields = [f.name for f in fields(cls) if f.type in (datetime, 'datetime')]
+    # attrgetter reads every field in one C call and works for __slots__ classes
+    get_values = operator.attrgetter(*names)
+    
+    def encode(row) -> Dict[str, Any]:
+        values = get_values(row)
+        encoded = dict(zip(names, values)) if len(names) > 1 else {names[0]: values}
+        for name in datetime_fields:
+            value = encoded[name]
+            if value is not None:
+                encoded[name] = value.isoformat()
+        return encoded
+    
+    return encode
+
+def _dict_encoder(row: Any) -> Dict[str, Any]:
+    """Encode a dict (or plain object) row, converting any datetime values."""
+    items = row.items() if isinstance(row, dict) else row.__dict__.items()
+    return {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in items
+    }
+
+# Coarse shared clock: timestamps are refreshed at most every 10ms, which is
+# far below the precision anyone reads from logs or events
+_CLOCK_TICK_NS = 10_000_000
+_clock = (0, datetime.fromtimestamp(0, UTC), datetime.fromtimestamp(0, UTC).isoformat())
+
+def _tick() -> tuple:
+    """Return the current (ns, datetime, isoformat) tick, refreshing if stale."""
+    global _clock
+    now_ns = time.time_ns()
+    if now_ns - _clock[0] > _CLOCK_TICK_NS:
+        now = datetime.fromtimestamp(now_ns / 1e9, UTC)
+        # Single tuple assignment so readers never see a torn update
+        _clock = (now_ns, now, now.isoformat())
+    return _clock
+
+def _now() -> datetime:
+    """Current UTC datetime at 10ms resolution."""
+    return _tick()[1]
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string at 10ms resolution."""
+    return _tick()[2]
+
+_LEVEL_MAP = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+}
+
+class _LazyLogPayload:
+    """
+    Log message that serializes its structured payload only when formatted.
+    
+    Records filtered out by a handler (or never emitted) never pay for JSON
+    encoding, and the encoded string is reused across handlers.
+    """
+    __slots__ = ("template", "message", "timestamp", "_encoded")
+    
+    def __init__(self, template: Dict[str, Any], message: str, timestamp: str):
+        self.template = template
+        self.message = message
+        self.timestamp = timestamp
+        self._encoded = None
+    
+    def __str__(self) -> str:
+        if self._encoded is None:
+            payload = dict(self.template)
+            payload["message"] = self.message
+            payload["timestamp"] = self.timestamp
+            self._encoded = _json_dumps(payload)
+        return self._encoded
+
+@functools.lru_cache(maxsize=1)
+def _load_monitoring():
+    """Import the Cloud Monitoring client library once per process."""
+    from google.cloud import monitoring_v3
+    return monitoring_v3
+
+# asyncio primitives bind to the loop that first uses them, so keep one
+# semaphore per loop (asyncio.run() creates a fresh loop each time)
+_gemini_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def _gemini_semaphore() -> asyncio.Semaphore:
+    """Semaphore capping in-flight Gemini requests on the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _gemini_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _gemini_semaphores[loop] = asyncio.Semaphore(GEMINI_MAX_IN_FLIGHT)
+    return semaphore
+
+# Gemini requests currently in flight, keyed by prompt_key(). Check and
+# insert happen without an await in between, so no lock is needed.
+_gemini_inflight: Dict[str, asyncio.Task] = {}
+
+def _discard_inflight(key: str, task: asyncio.Task) -> None:
+    """Forget a finished request (unless a newer one already took its key)."""
+    if _gemini_inflight.get(key) is task:
+        del _gemini_inflight[key]
+    # Mark the exception as retrieved in case every waiter was cancelled
+    if not task.cancelled():
+        task.exception()
+
+# Secret Manager payloads by (secret_id, version) -> (value, monotonic fetch time)
+SECRET_CACHE_TTL = float(os.getenv("PG_SECRET_CACHE_TTL", "300"))
+_SECRET_CACHE: Dict[tuple, tuple] = {}
+_secret_cache_lock = threading.Lock()
+
+_cloud_logging_client = None
+
+def _create_cloud_log_handler(name: str) -> Optional[logging.Handler]:
+    """
+    Create a Cloud Logging handler whose records are batched by a worker thread.
+    
+    Returns None when google-cloud-logging is not installed, no Google Cloud
+    credentials can be found or no project can be determined, so the caller
+    can fall back to local logging.
+    """
+    global _cloud_logging_client
+    try:
+        from google.auth.exceptions import DefaultCredentialsError
+        from google.cloud import logging as cloud_logging
+        from google.cloud.logging_v2.handlers import CloudLoggingHandler
+        from google.cloud.logging_v2.handlers.transports import BackgroundThreadTransport
+    except ImportError:
+        return None
+    
+    try:
+        if _cloud_logging_client is None:
+            _cloud_logging_client = cloud_logging.Client()
+    except (DefaultCredentialsError, OSError):
+        # OSError: credentials were found but no project could be determined
+        return None
+    
+    return CloudLoggingHandler(
+        _cloud_logging_client,
+        name=name,
+        transport=functools.partial(
+            BackgroundThreadTransport, batch_size=100, max_latency=0.5, grace_period=5
+        )
+    )
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentEvent:
     """
     Standardized event structure for inter-agent communication.
@@ -122,7 +389,7 @@ class AgentEvent:
     data: Dict[str, Any]
     correlation_id: str
 
-@dataclass
+@dataclass(slots=True)
 class ScanResult:
     """
     Standardized scan result structure for privacy violations.
@@ -168,11 +435,13 @@ class BaseAgent(ABC):
     - Provides get_gemini_analysis() method for AI-powered processing
     - Gracefully falls back to hardcoded rules when AI is unavailable
     - Manages token limits and response parsing
+    - Serves repeated prompts from a process-wide prompt cache, and
+      near-identical opted-in prompts from a semantic cache
     
     Event System:
     - publish_event(): Publish events for other agents to consume
     - consume_event(): Consume events from other agents
-    - Event history tracking for monitoring and debugging
+    - Bounded event history (last EVENT_HISTORY_LIMIT events) for monitoring and debugging
     
     Logging:
     - Google Cloud Logging integration with local fallback
@@ -180,6 +449,31 @@ class BaseAgent(ABC):
     - Activity tracking and performance monitoring
     """
     
+    # Shared by every agent in the process. Exact prompts are answered the
+    # same for every agent; semantic rows are namespaced by agent_id.
+    _PROMPT_CACHE = PromptCache()
+    _SEM_CACHE = SemanticCache()
+    
+    # Pending (agent, metric_type, value, labels, time_ns) points, drained
+    # in batches by a single daemon thread shared by all agents. A
+    # threading.Event in the queue asks the flusher to write what it holds
+    # now and set the event (see flush_metrics()).
+    _METRIC_QUEUE: "queue.Queue" = queue.Queue()
+    _metric_flusher: Optional[threading.Thread] = None
+    _metric_flusher_lock = threading.Lock()
+    
+    # Strong references to fire-and-forget sink tasks so they are not
+    # garbage collected before they finish
+    _BACKGROUND_TASKS: set = set()
+    
+    # Write-behind buffer of serialized BigQuery rows shared by all agents:
+    # table_id -> (agent that last queued rows, rows). The agent is only held
+    # until the next flush, which writes with its client and logs through it.
+    _BQ_BUFFER: Dict[str, tuple] = {}
+    _bq_lock = threading.Lock()
+    _bq_timer: Optional[threading.Timer] = None
+    _bq_atexit_registered = False
+    
     def __init__(self, agent_id: str, agent_name: str):
         """
         Initialize the base agent with AI capabilities and logging.
@@ -190,14 +484,25 @@ class BaseAgent(ABC):
         """
         self.agent_id = agent_id
         self.agent_name = agent_name
+        # Fields shared by every structured log record from this agent
+        self._log_template = {"agent_id": agent_id, "agent_name": agent_name}
         self.logger = self._setup_logging()
-        self.events_published: List[AgentEvent] = []
-        self.events_consumed: List[AgentEvent] = []
+        # Bounded event history; the totals keep counting after eviction
+        self.events_published: deque = deque(maxlen=EVENT_HISTORY_LIMIT)
+        self.events_consumed: deque = deque(maxlen=EVENT_HISTORY_LIMIT)
+        self._events_published_total = 0
+        self._events_consumed_total = 0
         self.gemini_model = None
+        # Preamble hash -> (CachedContent, cached model, monotonic expiry);
+        # (None, None, retry time) after a failed creation
+        self._cached_contents: Dict[str, tuple] = {}
+        # Preamble hash -> lock held while its cache is being created
+        self._cache_creation_locks: Dict[str, threading.Lock] = {}
+        # Preamble hashes known to be below the caching threshold
+        self._uncacheable_preambles: set = set()
         self._initialize_gemini()
-        self.bigquery_client = self._initialize_bigquery()
-        self.secret_manager_client = self._initialize_secret_manager()
-        self.monitoring_client = self._initialize_monitoring()
+        # BigQuery, Secret Manager and Monitoring clients are built lazily on
+        # first access (see the cached properties below)
         
     def _initialize_gemini(self):
         """
@@ -206,32 +511,112 @@ class BaseAgent(ABC):
         Attempts to initialize Gemini AI using Google Cloud credentials.
         Falls back gracefully if credentials are not available or initialization fails.
         """
-        if not GEMINI_AVAILABLE:
+        # Checked first so agents without a project never pay the SDK import
+        if not _CFG.project_id:
+            self.logger.warning("GOOGLE_CLOUD_PROJECT not set - Gemini AI disabled")
+            return
+        
+        if _load_gemini()[1] is None:
             self.logger.warning("Gemini AI not available - using hardcoded rules only")
             return
             
         try:
-            project_id = os.getenv('GOOGLE_CLOUD_PROJECT')
-            location = os.getenv('GOOGLE_CLOUD_LOCATION', 'us-central1')
-            
-            if project_id:
-                aiplatform.init(project=project_id, location=location)
-                self.gemini_model = GenerativeModel("gemini-2.0-flash")
-                self.logger.info(f"✅ Gemini AI initialized for {self.agent_name}")
-            else:
-                self.logger.warning("GOOGLE_CLOUD_PROJECT not set - Gemini AI disabled")
-                
+            self.gemini_model = _shared_gemini_model()
+            self.logger.info(f"✅ Gemini AI initialized for {self.agent_name}")
         except Exception as e:
             self.logger.warning(f"Failed to initialize Gemini AI: {str(e)} - using hardcoded rules")
             self.gemini_model = None
     
-    async def get_gemini_analysis(self, prompt: str, context: Dict[str, Any] = None) -> Optional[str]:
+    def _ensure_cache(self, system_preamble: str, tools=None):
+        """
+        Get (or create) a Vertex AI context cache for a stable prompt preamble.
+        
+        The preamble is counted once; prefixes below the Vertex AI caching
+        threshold are remembered as uncacheable so they are never re-counted.
+        Concurrent callers share a single creation per preamble, and after a
+        transient failure the preamble is sent inline for
+        CONTEXT_CACHE_RETRY_DELAY seconds before creation is retried.
+        
+        Args:
+            system_preamble: Stable instructions shared by many calls
+            tools: Optional tool declarations to cache alongside the preamble
+            
+        Returns:
+            GenerativeModel bound to the cached content, or None if the
+            preamble cannot be cached
+        """
+        if not CONTEXT_CACHE_ENABLED or not system_preamble:
+            return None
+        caching, GenerativeModel = _load_context_caching()
+        if caching is None:
+            return None
+        
+        key = _preamble_key(system_preamble)
+        if key in self._uncacheable_preambles:
+            return None
+        
+        entry = self._cached_contents.get(key)
+        if entry and entry[2] > time.monotonic():
+            return entry[1]
+        
+        # setdefault is atomic, so every thread gets the same lock per preamble
+        with self._cache_creation_locks.setdefault(key, threading.Lock()):
+            # Another thread may have created (or failed to create) it meanwhile
+            if key in self._uncacheable_preambles:
+                return None
+            entry = self._cached_contents.get(key)
+            if entry and entry[2] > time.monotonic():
+                return entry[1]
+            
+            try:
+                token_count = self.gemini_model.count_tokens(system_preamble).total_tokens
+                if token_count < CONTEXT_CACHE_MIN_TOKENS:
+                    self._uncacheable_preambles.add(key)
+                    return None
+                
+                cached_content = caching.CachedContent.create(
+                    model_name=GEMINI_MODEL_NAME,
+                    system_instruction=system_preamble,
+                    tools=tools,
+                    ttl=CONTEXT_CACHE_TTL
+                )
+                cached_model = GenerativeModel.from_cached_content(cached_content=cached_content)
+                # Refresh a little early so requests never race the server-side expiry
+                expires_at = time.monotonic() + CONTEXT_CACHE_TTL.total_seconds() - 30
+                self._cached_contents[key] = (cached_content, cached_model, expires_at)
+                self.log_activity(f"Created Gemini context cache ({token_count} tokens)")
+                return cached_model
+            except Exception as e:
+                # Likely transient (quota, network): back off instead of giving up for good
+                self.log_activity(f"Gemini context cache unavailable: {str(e)} - sending full prompt", "warning")
+                self._cached_contents[key] = (None, None, time.monotonic() + CONTEXT_CACHE_RETRY_DELAY)
+                return None
+    
+    async def get_gemini_analysis(self, prompt: str, context: Dict[str, Any] = None,
+                                  system_preamble: Optional[str] = None,
+                                  allow_cache: bool = True,
+                                  response_schema: Optional[Dict[str, Any]] = None,
+                                  allow_semantic_cache: bool = False) -> Optional[str]:
         """
         Get AI analysis from Google Gemini with fallback.
         
         Args:
             prompt: The prompt to send to Gemini AI
             context: Optional context data to include with the prompt
+            system_preamble: Optional stable instructions shared across calls.
+                When large enough it is served from a Vertex AI context cache
+                and only the prompt and context are sent per call.
+            allow_cache: Set to False for sensitive prompts that must never be
+                answered from, or written to, the local prompt and semantic caches
+            response_schema: Optional OpenAPI-style schema. Gemini then returns
+                JSON constrained to it (response_mime_type application/json),
+                so the schema does not need to be spelled out in the prompt.
+            allow_semantic_cache: Also answer from responses to similar
+                prompts. Only prompts that are safe to share across scans
+                should opt in: the embedding model reads just the first 256
+                word pieces, so a near match can differ in exactly the file,
+                line or counts the answer depends on. Exact prompt matches
+                are always reused.
             
         Returns:
             AI response text if successful, None if AI is unavailable or fails
@@ -248,27 +633,97 @@ class BaseAgent(ABC):
         try:
             # Enhance prompt with context if provided
             if context:
-                context_str = json.dumps(context, indent=2)
-                enhanced_prompt = f"{prompt}\n\nContext:\n{context_str}"
+                context_str = _json_dumps(context)
+                variable_suffix = f"{prompt}\n\nContext:\n{context_str}"
             else:
-                enhanced_prompt = prompt
-                
-            response = await asyncio.to_thread(
-                self.gemini_model.generate_content,
-                enhanced_prompt,
-                generation_config={
-                    "max_output_tokens": 2000,
-                    "temperature": 0.1
-                }
-            )
+                variable_suffix = prompt
             
-            self.logger.info(f"🤖 Gemini analysis completed for {self.agent_name}")
-            return response.text
+            # Namespace by preamble and schema as well, since only the suffix is embedded
+            schema_str = _json_dumps(response_schema) if response_schema else None
+            cache_namespace = self.agent_id
+            if system_preamble or schema_str:
+                cache_namespace = f"{self.agent_id}:{_preamble_key((system_preamble or '') + (schema_str or ''))}"
+            
+            key = prompt_key(system_preamble, variable_suffix, schema_str)
+            embedding = None
+            if allow_cache:
+                cached_response = self._PROMPT_CACHE.get(key)
+                if cached_response is not None:
+                    self.logger.debug(f"Prompt cache hit for {self.agent_name}")
+                    return cached_response
+            
+            if allow_cache and allow_semantic_cache:
+                cached_response, embedding = await asyncio.to_thread(
+                    self._SEM_CACHE.lookup, cache_namespace, variable_suffix
+                )
+                if cached_response is not None:
+                    self.logger.debug(f"Semantic cache hit for {self.agent_name}")
+                    return cached_response
+            
+            # Identical concurrent prompts (from any agent) share one Vertex call
+            loop = asyncio.get_running_loop()
+            task = _gemini_inflight.get(key)
+            if task is None or task.get_loop() is not loop:
+                task = loop.create_task(self._generate_content(variable_suffix, system_preamble, response_schema))
+                _gemini_inflight[key] = task
+                task.add_done_callback(lambda done, key=key: _discard_inflight(key, done))
+            else:
+                self.logger.debug(f"Joined in-flight Gemini request for {self.agent_name}")
+            # shield() so one cancelled caller does not cancel the shared request
+            response_text = await asyncio.shield(task)
+            
+            if allow_cache:
+                self._PROMPT_CACHE.put(key, response_text)
+            if allow_cache and allow_semantic_cache:
+                await asyncio.to_thread(
+                    self._SEM_CACHE.store, cache_namespace, variable_suffix, response_text, embedding
+                )
+            return response_text
             
         except Exception as e:
             self.logger.warning(f"Gemini analysis failed: {str(e)} - using hardcoded rules")
             return None
     
+    async def _generate_content(self, variable_suffix: str, system_preamble: Optional[str],
+                                response_schema: Optional[Dict[str, Any]] = None) -> str:
+        """Send one request to Gemini, using a context cache for the preamble when possible."""
+        model = None
+        if system_preamble:
+            model = await asyncio.to_thread(self._ensure_cache, system_preamble)
+        
+        if model is not None:
+            enhanced_prompt = variable_suffix
+        else:
+            model = self.gemini_model
+            enhanced_prompt = f"{system_preamble}\n\n{variable_suffix}" if system_preamble else variable_suffix
+            
+        # A GenerationConfig object (not a dict) so the SDK converts the
+        # OpenAPI-style response_schema into its proto Schema
+        GenerationConfig = _load_gemini()[2]
+        if response_schema:
+            generation_config = GenerationConfig(
+                max_output_tokens=2000,
+                temperature=0.1,
+                response_mime_type="application/json",
+                response_schema=response_schema
+            )
+        else:
+            generation_config = GenerationConfig(max_output_tokens=2000, temperature=0.1)
+            
+        async with _gemini_semaphore():
+            response = await model.generate_content_async(
+                enhanced_prompt,
+                generation_config=generation_config
+            )
+        
+        usage = getattr(response, "usage_metadata", None)
+        cached_tokens = getattr(usage, "cached_content_token_count", 0) if usage else 0
+        if cached_tokens:
+            self.log_activity(f"Gemini served {cached_tokens} prompt tokens from context cache")
+        
+        self.logger.info(f"🤖 Gemini analysis completed for {self.agent_name}")
+        return response.text
+    
     def is_gemini_available(self) -> bool:
         """
         Check if Gemini AI is available for this agent.
@@ -280,23 +735,33 @@ class BaseAgent(ABC):
         
     def _setup_logging(self) -> logging.Logger:
         """
-        Setup logging for the agent using StructuredLogHandler.
+        Setup logging for the agent using Cloud Logging with background batching.
         
-        Uses Google Cloud's StructuredLogHandler for production-grade logging.
-        Falls back to local logging if Cloud Logging is not available.
+        Records are queued by a BackgroundThreadTransport and flushed in batches,
+        so logging never blocks the caller on serialization or network writes.
+        Falls back to a local stream handler when no Google Cloud credentials
+        are available.
         
         Returns:
             Configured logger instance
         """
-        try:
-            # Use StructuredLogHandler (already configured globally)
-            logger = logging.getLogger(f"privacy_guardian.{self.agent_id}")
-            logger.setLevel(logging.INFO)
+        logger = logging.getLogger(f"privacy_guardian.{self.agent_id}")
+        logger.setLevel(logging.INFO)
+        if logger.handlers:
+            # Another instance of this agent already attached a handler
             return logger
-        except Exception as e:
-            # Fallback to local logging if Cloud Logging fails
-            logging.basicConfig(level=logging.INFO)
-            return logging.getLogger(f"privacy_guardian.{self.agent_id}")
+        
+        handler = _create_cloud_log_handler(f"privacy_guardian.{self.agent_id}")
+        if handler is not None:
+            atexit.register(handler.flush)
+        else:
+            # Fallback to local logging if Cloud Logging is not available
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        
+        logger.addHandler(handler)
+        logger.propagate = False
+        return logger
     
     @abstractmethod
     async def process(self, input_data: Any) -> Any:
@@ -332,11 +797,12 @@ class BaseAgent(ABC):
         event = AgentEvent(
             event_type=event_type,
             agent_id=self.agent_id,
-            timestamp=datetime.now(UTC),
+            timestamp=_now(),
             data=data,
             correlation_id=correlation_id
         )
         self.events_published.append(event)
+        self._events_published_total += 1
         self.logger.info(f"📤 Published event: {event_type} with correlation_id: {correlation_id}")
         return event
     
@@ -351,8 +817,37 @@ class BaseAgent(ABC):
             event: The event to consume
         """
         self.events_consumed.append(event)
+        self._events_consumed_total += 1
         self.logger.info(f"📥 Consumed event: {event.event_type} from {event.agent_id}")
     
+    def _score_batch(self, results: List[ScanResult], weights=None):
+        """
+        Severity weight of every result as a float32 NumPy array.
+        
+        Uses the compiled kernels in agents.numerics (Numba when installed).
+        
+        Args:
+            results: Scan results to score
+            weights: Optional (LOW, MEDIUM, HIGH) weights
+        """
+        from . import numerics
+        return numerics.score_results(results, weights or numerics.DEFAULT_SEVERITY_WEIGHTS)
+    
+    def _group_by_severity(self, results: List[ScanResult]) -> Dict[str, List[ScanResult]]:
+        """Group results by severity (LOW/MEDIUM/HIGH/UNKNOWN), preserving order."""
+        from . import numerics
+        return numerics.group_results_by_severity(results)
+    
+    def _result_batch(self, results: List[ScanResult]):
+        """
+        Columnar ScanResultBatch for a list of results.
+        
+        Use batch.to_arrow() when shipping large result sets in event payloads,
+        e.g. ``self.publish_event("ScanComplete", {"batch": batch.to_arrow()})``.
+        """
+        from .numerics import ScanResultBatch
+        return ScanResultBatch.from_results(results)
+    
     def get_agent_status(self) -> Dict[str, Any]:
         """
         Get current agent status for monitoring.
@@ -367,10 +862,10 @@ class BaseAgent(ABC):
             "agent_id": self.agent_id,
             "agent_name": self.agent_name,
             "status": "active",
-            "events_published": len(self.events_published),
-            "events_consumed": len(self.events_consumed),
+            "events_published": self._events_published_total,
+            "events_consumed": self._events_consumed_total,
             "gemini_available": self.is_gemini_available(),
-            "last_activity": datetime.now(UTC).isoformat()
+            "last_activity": _now_iso()
         }
     
     def log_activity(self, message: str, level: str = "info") -> None:
@@ -384,27 +879,35 @@ class BaseAgent(ABC):
             message: Activity message to log
             level: Log level (info, warning, error, debug)
         """
-        log_data = {
-            "agent_id": self.agent_id,
-            "agent_name": self.agent_name,
-            "message": message,
-            "timestamp": datetime.now(UTC).isoformat()
-        }
-        
-        if level == "info":
-            self.logger.info(json.dumps(log_data))
-        elif level == "warning":
-            self.logger.warning(json.dumps(log_data))
-        elif level == "error":
-            self.logger.error(json.dumps(log_data))
-        elif level == "debug":
-            self.logger.debug(json.dumps(log_data))
+        level_no = _LEVEL_MAP.get(level)
+        if level_no is None or not self.logger.isEnabledFor(level_no):
+            return
+        self.logger.log(
+            level_no,
+            _LazyLogPayload(self._log_template, message, _now_iso())
+        )
+
+    @cached_property
+    def bigquery_client(self):
+        """BigQuery client, created on first use (None if unavailable)."""
+        return self._initialize_bigquery()
+
+    @cached_property
+    def secret_manager_client(self):
+        """Secret Manager client, created on first use (None if unavailable)."""
+        return self._initialize_secret_manager()
+
+    @cached_property
+    def monitoring_client(self):
+        """Cloud Monitoring client, created on first use (None if unavailable)."""
+        return self._initialize_monitoring()
 
     def _initialize_bigquery(self):
         """
         Initialize BigQuery client for analytics.
         """
         try:
+            from google.cloud import bigquery
             client = bigquery.Client()
             self.log_activity("BigQuery client initialized successfully")
             return client
@@ -417,6 +920,7 @@ class BaseAgent(ABC):
         Initialize Secret Manager client for secure config.
         """
         try:
+            from google.cloud import secretmanager
             client = secretmanager.SecretManagerServiceClient()
             self.log_activity("Secret Manager client initialized successfully")
             return client
@@ -429,7 +933,7 @@ class BaseAgent(ABC):
         Initialize Cloud Monitoring client for custom metrics.
         """
         try:
-            client = monitoring_v3.MetricServiceClient()
+            client = _load_monitoring().MetricServiceClient()
             self.log_activity("Cloud Monitoring client initialized successfully")
             return client
         except Exception as e:
@@ -438,10 +942,21 @@ class BaseAgent(ABC):
 
     def insert_bigquery_analytics(self, table_id: str, rows: list):
         """
-        Insert analytics data into BigQuery table.
+        Queue analytics data for insertion into a BigQuery table.
+        
+        Rows are serialized immediately (so later mutations of the source
+        objects are not picked up) and buffered per table. The buffer is
+        flushed with a single insert_rows_json call once it holds 500 rows
+        or after one second, whichever comes first.
+        
         Args:
             table_id: Full BigQuery table ID (project.dataset.table)
-            rows: List of dictionaries to insert
+            rows: List of dictionaries or dataclass instances to insert
+            
+        Returns:
+            True once the rows are queued (not when they are written; insert
+            errors are logged by flush_bigquery()), False if BigQuery is
+            unavailable or the rows could not be serialized
         """
         if not self.bigquery_client:
             self.log_activity("BigQuery client not available", "warning")
@@ -450,51 +965,168 @@ class BaseAgent(ABC):
             self.log_activity("No rows to insert into BigQuery, skipping.", "info")
             return True
         try:
-            serializable_rows = []
-            for row in rows:
-                if hasattr(row, '__dict__'):
-                    serializable_row = {}
-                    for key, value in row.__dict__.items():
-                        if isinstance(value, datetime):
-                            serializable_row[key] = value.isoformat()
-                        else:
-                            serializable_row[key] = value
-                    serializable_rows.append(serializable_row)
-                else:
-                    serializable_row = {}
-                    for key, value in row.items():
-                        if isinstance(value, datetime):
-                            serializable_row[key] = value.isoformat()
-                        else:
-                            serializable_row[key] = value
-                    serializable_rows.append(serializable_row)
-            try:
-                errors = self.bigquery_client.insert_rows_json(table_id, serializable_rows)
-                if errors == []:
-                    self.log_activity(f"Inserted {len(serializable_rows)} rows into BigQuery: {table_id}")
-                    return True
-                else:
-                    self.log_activity(f"BigQuery insert errors: {errors}", "warning")
-                    return False
-            except Exception as table_error:
-                if "Not found" in str(table_error):
-                    self.log_activity(f"BigQuery table {table_id} not found - skipping analytics", "warning")
-                    return False
-                else:
-                    raise table_error
+            serializable_rows = [
+                _row_encoder(type(row))(row) if is_dataclass(row) else _dict_encoder(row)
+                for row in rows
+            ]
         except Exception as e:
             self.log_activity(f"BigQuery insert failed: {str(e)}", "warning")
             return False
+        
+        with BaseAgent._bq_lock:
+            entry = BaseAgent._BQ_BUFFER.get(table_id)
+            buffer = entry[1] if entry else []
+            buffer.extend(serializable_rows)
+            BaseAgent._BQ_BUFFER[table_id] = (self, buffer)
+            if not BaseAgent._bq_atexit_registered:
+                # Registered once for the class, so atexit never pins agents
+                atexit.register(BaseAgent.flush_bigquery)
+                BaseAgent._bq_atexit_registered = True
+            if len(buffer) >= BIGQUERY_BATCH_SIZE:
+                if BaseAgent._bq_timer is not None:
+                    BaseAgent._bq_timer.cancel()
+                BaseAgent._bq_timer = threading.Timer(0, BaseAgent.flush_bigquery)
+            elif BaseAgent._bq_timer is None:
+                BaseAgent._bq_timer = threading.Timer(BIGQUERY_MAX_LATENCY, BaseAgent.flush_bigquery)
+            else:
+                return True
+            BaseAgent._bq_timer.daemon = True
+            BaseAgent._bq_timer.start()
+        return True
+
+    @staticmethod
+    def flush_bigquery() -> bool:
+        """
+        Write every buffered analytics row (from any agent) to BigQuery.
+        
+        Returns:
+            True if all tables were written without errors, False otherwise
+        """
+        with BaseAgent._bq_lock:
+            pending = BaseAgent._BQ_BUFFER
+            BaseAgent._BQ_BUFFER = {}
+            if BaseAgent._bq_timer is not None:
+                BaseAgent._bq_timer.cancel()
+                BaseAgent._bq_timer = None
+        
+        success = True
+        for table_id, (agent, table_rows) in pending.items():
+            for start in range(0, len(table_rows), BIGQUERY_BATCH_SIZE):
+                chunk = table_rows[start:start + BIGQUERY_BATCH_SIZE]
+                try:
+                    errors = agent.bigquery_client.insert_rows_json(table_id, chunk)
+                    if errors == []:
+                        agent.log_activity(f"Inserted {len(chunk)} rows into BigQuery: {table_id}")
+                    else:
+                        agent.log_activity(f"BigQuery insert errors: {errors}", "warning")
+                        success = False
+                except Exception as e:
+                    if "Not found" in str(e):
+                        agent.log_activity(f"BigQuery table {table_id} not found - skipping analytics", "warning")
+                    else:
+                        agent.log_activity(f"BigQuery insert failed: {str(e)}", "warning")
+                    success = False
+                    break
+        return success
+
+    def run_in_background(self, func, *args, **kwargs) -> Optional[asyncio.Task]:
+        """
+        Run a blocking sink call (e.g. a BigQuery load) in a worker thread
+        without waiting for it.
+        
+        Falls back to calling func inline when no event loop is running.
+        asyncio.run() waits for the default executor on shutdown, so started
+        calls still complete before the process exits.
+        
+        Returns:
+            The background task, or None if func ran inline
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            func(*args, **kwargs)
+            return None
+        
+        task = loop.create_task(asyncio.to_thread(func, *args, **kwargs))
+        self._BACKGROUND_TASKS.add(task)
+        task.add_done_callback(self._background_task_done)
+        return task
+    
+    def _background_task_done(self, task: asyncio.Task) -> None:
+        """Release a finished background task and log its failure, if any."""
+        self._BACKGROUND_TASKS.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.log_activity(f"Background sink failed: {str(task.exception())}", "warning")
+    
+    def load_bigquery_results(self, table_id: str, results,
+                              rows: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        Append scan results to a BigQuery table as one columnar load job.
+        
+        Results are packed into a ScanResultBatch, converted to an Arrow table
+        and uploaded as Parquet with load_table_from_file, so no per-row dicts
+        or JSON are built. Falls back to insert_bigquery_analytics() when
+        pyarrow is not installed.
+        
+        Args:
+            table_id: Full BigQuery table ID (project.dataset.table)
+            results: Scan results to append, as a list or a ScanResultBatch
+                snapshot (rows are then required for the fallback)
+            rows: Already-serialized dicts for the same results, reused by the
+                row-based fallback instead of encoding the results again
+        """
+        if not self.bigquery_client:
+            self.log_activity("BigQuery client not available", "warning")
+            return False
+        if not results:
+            self.log_activity("No rows to insert into BigQuery, skipping.", "info")
+            return True
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            return self.insert_bigquery_analytics(table_id, rows if rows is not None else results)
+        
+        try:
+            from google.cloud import bigquery
+            
+            buffer = io.BytesIO()
+            batch = results if hasattr(results, "to_arrow") else self._result_batch(results)
+            pq.write_table(batch.to_arrow(), buffer)
+            buffer.seek(0)
+            job_config = bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.PARQUET,
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND
+            )
+            self.bigquery_client.load_table_from_file(buffer, table_id, job_config=job_config)
+            self.log_activity(f"Started BigQuery load of {len(results)} rows: {table_id}")
+            return True
+        except Exception as e:
+            if "Not found" in str(e):
+                self.log_activity(f"BigQuery table {table_id} not found - skipping analytics", "warning")
+            else:
+                self.log_activity(f"BigQuery load failed: {str(e)}", "warning")
+            return False
 
     def fetch_secret(self, secret_id: str, version: str = "latest") -> str:
         """
         Fetch a secret value from Secret Manager.
+        
+        Values are cached process-wide for SECRET_CACHE_TTL seconds, so agents
+        reading the same secret repeatedly make one Secret Manager call.
+        Failed fetches are not cached.
+        
         Args:
             secret_id: Secret resource name (projects/*/secrets/*)
             version: Secret version (default: latest)
         Returns:
             Secret payload as string, or empty string if not found
         """
+        key = (secret_id, version)
+        with _secret_cache_lock:
+            hit = _SECRET_CACHE.get(key)
+        if hit and time.monotonic() - hit[1] < SECRET_CACHE_TTL:
+            return hit[0]
+        
         if not self.secret_manager_client:
             self.log_activity("Secret Manager client not available", "warning")
             return ""
@@ -502,15 +1134,34 @@ class BaseAgent(ABC):
             name = f"{secret_id}/versions/{version}"
             response = self.secret_manager_client.access_secret_version(request={"name": name})
             secret = response.payload.data.decode("UTF-8")
+            with _secret_cache_lock:
+                _SECRET_CACHE[key] = (secret, time.monotonic())
             self.log_activity(f"Fetched secret: {secret_id}")
             return secret
         except Exception as e:
             self.log_activity(f"Failed to fetch secret {secret_id}: {str(e)}", "warning")
             return ""
+    
+    @staticmethod
+    def invalidate_secret(secret_id: str) -> None:
+        """
+        Drop every cached version of a secret, e.g. after rotating it.
+        
+        Args:
+            secret_id: Secret resource name (projects/*/secrets/*)
+        """
+        with _secret_cache_lock:
+            for key in [key for key in _SECRET_CACHE if key[0] == secret_id]:
+                del _SECRET_CACHE[key]
 
     def export_custom_metric(self, metric_type: str, value: float, labels: dict = None):
         """
         Export a custom metric to Cloud Monitoring.
+        
+        The point is queued and written by a background flusher that batches
+        up to 200 series per create_time_series call, so this returns
+        immediately.
+        
         Args:
             metric_type: Custom metric type (e.g., custom.googleapis.com/agent/scan_duration)
             value: Metric value
@@ -519,52 +1170,128 @@ class BaseAgent(ABC):
         if not self.monitoring_client:
             self.log_activity("Cloud Monitoring client not available", "warning")
             return False
-        try:
-            project_id = os.getenv('GOOGLE_CLOUD_PROJECT')
-            if not project_id:
-                self.log_activity("GOOGLE_CLOUD_PROJECT not set - skipping metric export", "warning")
-                return False
-            
-            series = monitoring_v3.TimeSeries()
-            series.metric.type = metric_type
-            if labels:
-                series.metric.labels.update(labels)
-            series.resource.type = "global"
-            series.resource.labels["project_id"] = project_id
-            
-            point = monitoring_v3.Point()
-            point.value.double_value = value
-            
-            from google.protobuf.timestamp_pb2 import Timestamp
-            from google.cloud.monitoring_v3.types import TimeInterval
-            
-            # Create timestamp properly with error handling
+        if not _CFG.project_id:
+            self.log_activity("GOOGLE_CLOUD_PROJECT not set - skipping metric export", "warning")
+            return False
+        
+        self._ensure_metric_flusher()
+        self._METRIC_QUEUE.put((
+            self, metric_type, value, tuple(sorted((labels or {}).items())), time.time_ns()
+        ))
+        return True
+
+    @classmethod
+    def _ensure_metric_flusher(cls) -> None:
+        """Start the shared metric flusher thread on first use."""
+        if BaseAgent._metric_flusher is not None:
+            return
+        with BaseAgent._metric_flusher_lock:
+            if BaseAgent._metric_flusher is None:
+                # Set on BaseAgent, not cls, so every subclass shares one flusher
+                BaseAgent._metric_flusher = threading.Thread(
+                    target=BaseAgent._metric_flush_loop, name="privacy_guardian-metrics", daemon=True
+                )
+                BaseAgent._metric_flusher.start()
+                atexit.register(BaseAgent.flush_metrics)
+
+    @classmethod
+    def _metric_flush_loop(cls) -> None:
+        """
+        Collect queued points for up to METRIC_MAX_LATENCY seconds and write them.
+        
+        A flush request (threading.Event) ends the batch early; it is set once
+        every point queued before it has been written.
+        """
+        while True:
+            item = cls._METRIC_QUEUE.get()
+            batch = []
+            flush_requested = None
+            if isinstance(item, threading.Event):
+                flush_requested = item
+            else:
+                batch.append(item)
+                deadline = time.monotonic() + METRIC_MAX_LATENCY
+                while len(batch) < METRIC_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = cls._METRIC_QUEUE.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        flush_requested = item
+                        break
+                    batch.append(item)
+            if batch:
+                cls._write_metric_batch(batch)
+            if flush_requested is not None:
+                flush_requested.set()
+
+    @classmethod
+    def flush_metrics(cls) -> None:
+        """
+        Synchronously write every pending metric point.
+        
+        The flusher thread is asked to write the batch it is collecting
+        (queue draining alone would miss it); points it does not reach
+        within METRIC_FLUSH_TIMEOUT are written here.
+        """
+        flusher = BaseAgent._metric_flusher
+        if flusher is not None and flusher.is_alive():
+            written = threading.Event()
+            cls._METRIC_QUEUE.put(written)
+            written.wait(METRIC_FLUSH_TIMEOUT)
+        
+        batch = []
+        while True:
             try:
-                current_time = datetime.now(UTC)
-                timestamp = Timestamp()
-                timestamp.FromDatetime(current_time)
-                
-                # Validate timestamp was created successfully
-                if not hasattr(timestamp, 'seconds') or timestamp.seconds is None:
-                    self.log_activity(f"Failed to create valid timestamp for metric {metric_type}", "warning")
-                    return False
-                
-                interval = TimeInterval()
-                interval.end_time = timestamp  # Direct assignment
-                point.interval = interval  # Direct assignment
-                series.points = [point]
-                
-                self.monitoring_client.create_time_series(name=f"projects/{project_id}", time_series=[series])
-                self.log_activity(f"Exported custom metric: {metric_type}={value}")
-                return True
-                
-            except Exception as timestamp_error:
-                self.log_activity(f"Timestamp creation failed for metric {metric_type}: {str(timestamp_error)}", "warning")
-                return False
+                item = cls._METRIC_QUEUE.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(item, threading.Event):
+                batch.append(item)
+        for start in range(0, len(batch), METRIC_BATCH_SIZE):
+            cls._write_metric_batch(batch[start:start + METRIC_BATCH_SIZE])
+
+    @staticmethod
+    def _write_metric_batch(batch: List[tuple]) -> None:
+        """
+        Write queued points grouped per agent, one create_time_series call each.
+        
+        Cloud Monitoring rejects two points for the same series in one request,
+        so only the most recent value per (metric_type, labels) is sent.
+        """
+        from google.protobuf.timestamp_pb2 import Timestamp
+        TimeSeries = _load_monitoring().TimeSeries
+        
+        resource = {"type": "global", "labels": {"project_id": _CFG.project_id}}
+        latest_by_agent: Dict[BaseAgent, Dict[tuple, tuple]] = {}
+        for agent, metric_type, value, labels, ts_ns in batch:
+            latest_by_agent.setdefault(agent, {})[(metric_type, labels)] = (value, ts_ns)
+        
+        for agent, points in latest_by_agent.items():
+            try:
+                # Build each series in one constructor call from plain mappings
+                # rather than allocating and mutating Point/TimeInterval wrappers
+                series_list = []
+                for (metric_type, labels), (value, ts_ns) in points.items():
+                    seconds, nanos = divmod(ts_ns, 1_000_000_000)
+                    series_list.append(TimeSeries(
+                        metric={"type": metric_type, "labels": dict(labels)},
+                        resource=resource,
+                        points=[{
+                            "interval": {"end_time": Timestamp(seconds=seconds, nanos=nanos)},
+                            "value": {"double_value": value},
+                        }]
+                    ))
                 
-        except Exception as e:
-            self.log_activity(f"Failed to export custom metric {metric_type}: {str(e)}", "warning")
-            return False
+                agent.monitoring_client.create_time_series(
+                    name=f"projects/{_CFG.project_id}", time_series=series_list
+                )
+                agent.log_activity(f"Exported {len(series_list)} custom metric(s) to Cloud Monitoring")
+            except Exception as e:
+                agent.log_activity(f"Failed to export custom metrics: {str(e)}", "warning")
 
     # Cloud Function trigger template (for reference)
     # def cloud_function_entrypoint(request):
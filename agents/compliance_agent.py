@@ -863,15 +863,9 @@ Focus on practical compliance guidance and regulatory requirements.
         if not scan_results:
             return 100
         
-        # Weight violations by severity
-        total_weight = 0
-        for result in scan_results:
-            if result.severity == "HIGH":
-                total_weight += 3
-            elif result.severity == "MEDIUM":
-                total_weight += 2
-            else:
-                total_weight += 1
+        # Weight violations by severity (HIGH=3, MEDIUM=2, anything else=1);
+        # summed in float64 so the integer total is exact
+        total_weight = float(self._score_batch(scan_results).sum(dtype="float64"))
         
         # Calculate score (higher weight = lower score)
         max_possible_weight = len(scan_results) * 3
@@ -880,8 +874,9 @@ Focus on practical compliance guidance and regulatory requirements.
 
     def _assess_risk_hardcoded(self, scan_results: List[ScanResult]) -> Dict[str, str]:
         """Assess risk using hardcoded rules"""
-        high_count = sum(1 for r in scan_results if r.severity == "HIGH")
-        medium_count = sum(1 for r in scan_results if r.severity == "MEDIUM")
+        by_severity = self._group_by_severity(scan_results)
+        high_count = len(by_severity.get("HIGH", []))
+        medium_count = len(by_severity.get("MEDIUM", []))
         
         if high_count > 5:
             business_risk = "HIGH"
@@ -901,8 +896,9 @@ Focus on practical compliance guidance and regulatory requirements.
         """Generate recommendations using hardcoded rules"""
         recommendations = []
         
-        high_violations = [r for r in scan_results if r.severity == "HIGH"]
-        medium_violations = [r for r in scan_results if r.severity == "MEDIUM"]
+        by_severity = self._group_by_severity(scan_results)
+        high_violations = by_severity.get("HIGH", [])
+        medium_violations = by_severity.get("MEDIUM", [])
         
         if high_violations:
             recommendations.append({
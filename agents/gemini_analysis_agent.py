@@ -118,11 +118,206 @@ Integrations:
 
 import os
 import asyncio
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import replace
 from typing import Dict, List, Any, Optional
 from datetime import datetime, UTC
 import json
 
-from .base_agent import BaseAgent, ScanResult, AgentEvent
+from .base_agent import BaseAgent, ScanResult, AgentEvent, _row_encoder
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Responses longer than this are stream-parsed, keeping only the sections
+# _process_enhanced_ai_response reads instead of building the whole tree
+STREAM_PARSE_THRESHOLD = 32_000
+_VIOLATION_SECTIONS = {
+    "enhanced_violations.item": "enhanced_violations",
+    "additional_violations.item": "additional_violations",
+}
+
+# Number of files whose leading content is memoized per agent
+FILE_CACHE_SIZE = 256
+
+# Packs every ScanResult field with one attrgetter call (timestamp as ISO 8601)
+_encode_scan_result = _row_encoder(ScanResult)
+
+# Static instructions for per-file analysis. Sent as the system preamble so
+# Gemini can serve it from a context cache; only the file details are sent
+# with each request. The response format is enforced by FILE_ANALYSIS_SCHEMA.
+FILE_ANALYSIS_PREAMBLE = """
+You are an expert privacy compliance analyst with deep knowledge of GDPR, CCPA, HIPAA, and other privacy regulations.
+
+You will be given a source file, the first 4000 characters of its content and
+the privacy violations detected in it.
+
+Please provide a comprehensive privacy analysis including:
+
+1. **Enhanced Violation Analysis**: For each detected violation:
+   - Detailed explanation of the privacy risk
+   - Specific regulatory violations (GDPR articles, CCPA sections, etc.)
+   - Business impact assessment
+   - Enhanced fix suggestions with code examples
+   - Related privacy concerns
+
+2. **Additional Violations**: Identify any related privacy issues not yet detected:
+   - Missing consent mechanisms
+   - Data retention violations
+   - Security vulnerabilities
+   - Privacy by design violations
+
+3. **Context Analysis**: How these violations relate to:
+   - Overall application architecture
+   - Data flow patterns
+   - User privacy rights
+   - Compliance requirements
+
+Focus on actionable insights that help developers understand the full scope of privacy implications and implement effective fixes.
+"""
+
+# Per-file part of the analysis prompt, filled in with str.format_map
+_FILE_PROMPT_TEMPLATE = """File: {file_path}
+Content (first 4000 characters):
+{file_content}
+
+Detected violations:
+{violations_text}
+"""
+
+def _fmt_violation(v: ScanResult) -> str:
+    """One line of the detected-violations list in the file prompt"""
+    return f"- Line {v.line_number}: {v.violation_type} - {v.description} [Severity: {v.severity}]"
+
+def _line_number(value: Any) -> int:
+    """Line number from model or caller data; 0 if missing, non-numeric or out of int32 range"""
+    try:
+        line_number = int(value)
+    except (TypeError, ValueError):
+        return 0
+    return line_number if 0 <= line_number < 2 ** 31 else 0
+
+# Static instructions for the scan-wide insights request (format: INSIGHTS_SCHEMA)
+INSIGHTS_PREAMBLE = """
+You are analyzing the results of a comprehensive privacy compliance scan.
+
+Please provide comprehensive insights including:
+
+1. **Overall Assessment**: Summary of privacy posture
+2. **Critical Issues**: Most urgent privacy concerns
+3. **Compliance Gaps**: Missing privacy controls
+4. **Risk Prioritization**: Which issues to address first
+5. **Strategic Recommendations**: Long-term privacy improvements
+"""
+
+# Response schemas passed to Gemini as response_schema (OpenAPI subset), so
+# responses are JSON of this shape without spelling it out in the prompt
+_LEVEL = {"type": "string", "enum": ["HIGH", "MEDIUM", "LOW"]}
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+
+FILE_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "enhanced_violations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "line_number": {"type": "integer"},
+                    "enhanced_description": {"type": "string"},
+                    "risk_assessment": _LEVEL,
+                    "business_impact": {"type": "string"},
+                    "enhanced_fix": {"type": "string"},
+                    "regulatory_articles": _STRINGS,
+                    "related_concerns": _STRINGS,
+                    "compliance_priority": {"type": "string", "enum": ["IMMEDIATE", "HIGH", "MEDIUM", "LOW"]}
+                },
+                "required": ["line_number", "enhanced_description", "risk_assessment"]
+            }
+        },
+        "additional_violations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "line_number": {"type": "integer"},
+                    "violation_type": {"type": "string"},
+                    "description": {"type": "string"},
+                    "severity": _LEVEL,
+                    "fix_suggestion": {"type": "string"},
+                    "regulation_reference": {"type": "string"},
+                    "compliance_impact": _LEVEL
+                },
+                "required": ["line_number", "violation_type", "description", "severity"]
+            }
+        },
+        "context_analysis": {
+            "type": "object",
+            "properties": {
+                "overall_risk_level": _LEVEL,
+                "compliance_gaps": _STRINGS,
+                "architectural_concerns": _STRINGS,
+                "recommendations": _STRINGS
+            }
+        }
+    },
+    "required": ["enhanced_violations", "additional_violations"]
+}
+
+INSIGHTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "overall_assessment": {
+            "type": "object",
+            "properties": {
+                "privacy_posture": {"type": "string", "enum": ["EXCELLENT", "GOOD", "FAIR", "POOR"]},
+                "compliance_status": {"type": "string", "enum": ["COMPLIANT", "PARTIALLY_COMPLIANT", "NON_COMPLIANT"]},
+                "risk_level": _LEVEL
+            }
+        },
+        "critical_issues": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "issue": {"type": "string"},
+                    "impact": {"type": "string"},
+                    "urgency": {"type": "string", "enum": ["IMMEDIATE", "HIGH", "MEDIUM"]}
+                }
+            }
+        },
+        "compliance_gaps": _STRINGS,
+        "risk_prioritization": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "priority": {"type": "string", "enum": ["1", "2", "3"]},
+                    "violation_types": _STRINGS,
+                    "rationale": {"type": "string"}
+                }
+            }
+        },
+        "strategic_recommendations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "recommendation": {"type": "string"},
+                    "timeline": {"type": "string"},
+                    "impact": {"type": "string"}
+                }
+            }
+        }
+    },
+    "required": ["overall_assessment"]
+}
 
 class GeminiAnalysisAgent(BaseAgent):
     """
@@ -160,6 +355,11 @@ class GeminiAnalysisAgent(BaseAgent):
         """Initialize the GeminiAnalysisAgent with AI capabilities."""
         super().__init__("gemini_analysis_agent", "🤖 GeminiAnalysisAgent")
         # Use base agent's Gemini initialization
+        # Maximum number of files analyzed by Gemini at the same time
+        self.gemini_concurrency = int(os.getenv("GEMINI_CONCURRENCY", "8"))
+        # path -> ((mtime_ns, size), first 4000 characters), least recently used first
+        self._file_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._file_cache_lock = threading.Lock()
         
     async def process(self, input_data: Dict[str, Any]) -> List[ScanResult]:
         """Process AI analysis request by listening for FindingsReady event"""
@@ -178,7 +378,9 @@ class GeminiAnalysisAgent(BaseAgent):
         
         # Convert scan results from dict to ScanResult objects if needed
         if isinstance(scan_results[0], dict):
-            scan_results = [self._dict_to_scan_result(result) for result in scan_results]
+            # Results without a timestamp all share one default
+            default_timestamp = datetime.now(UTC)
+            scan_results = [self._dict_to_scan_result(result, default_timestamp) for result in scan_results]
         
         # Check if Gemini is available
         if not self.is_gemini_available():
@@ -203,12 +405,42 @@ class GeminiAnalysisAgent(BaseAgent):
             # Group violations by file for efficient processing
             file_violations = self._group_violations_by_file(scan_results)
             
-            for file_path, violations in file_violations.items():
-                file_results = await self._analyze_file_violations(file_path, violations)
-                enhanced_results.extend(file_results)
+            # Analyze files concurrently; the semaphore is created per run since
+            # asyncio primitives are bound to the event loop that uses them
+            gemini_sem = asyncio.Semaphore(self.gemini_concurrency)
             
-            # Generate comprehensive AI insights
-            ai_insights = await self._generate_comprehensive_insights(scan_results, enhanced_results)
+            async def _bounded(file_path: str, violations: List[ScanResult]) -> tuple:
+                async with gemini_sem:
+                    return await self._analyze_file_violations(file_path, violations)
+            
+            file_results = await asyncio.gather(
+                *[_bounded(file_path, violations) for file_path, violations in file_violations.items()],
+                return_exceptions=True
+            )
+            
+            # One pass over the final results collects them, serializes them
+            # (the same dicts feed the event and BigQuery) and counts types
+            enhanced_dicts = []
+            type_counts = Counter()
+            any_enhanced = False
+            for (file_path, violations), outcome in zip(file_violations.items(), file_results):
+                if isinstance(outcome, Exception):
+                    self.log_activity(f"Error analyzing {file_path}: {str(outcome)} - using original violations", "warning")
+                    outcome = (violations, False)
+                results, file_enhanced = outcome
+                any_enhanced = any_enhanced or file_enhanced
+                for result in results:
+                    enhanced_results.append(result)
+                    enhanced_dicts.append(_encode_scan_result(result))
+                    type_counts[result.violation_type] += 1
+            
+            if not any_enhanced and len(enhanced_results) == len(scan_results):
+                # Gemini changed nothing, so a second request would only restate the scan
+                self.log_activity("No AI enhancements - summarizing insights locally")
+                ai_insights = self._fallback_insights(enhanced_results, type_counts)
+            else:
+                # Generate comprehensive AI insights
+                ai_insights = await self._generate_comprehensive_insights(scan_results, enhanced_results, type_counts)
             
             # Publish AIEnhancedFindings event for other agents to consume
             self.publish_event(
@@ -218,7 +450,7 @@ class GeminiAnalysisAgent(BaseAgent):
                     "enhanced_violations": len(enhanced_results),
                     "ai_enhancements": len(enhanced_results) - len(scan_results),
                     "ai_insights": ai_insights,
-                    "enhanced_results": [self._scan_result_to_dict(result) for result in enhanced_results],
+                    "enhanced_results": enhanced_dicts,
                     "gemini_enhanced": True
                 },
                 correlation_id
@@ -239,8 +471,11 @@ class GeminiAnalysisAgent(BaseAgent):
         # --- Google Cloud Integrations ---
         # Insert enhanced results analytics into BigQuery
         table_id = f"{os.getenv('GOOGLE_CLOUD_PROJECT')}.privacy.enhanced_results"
-        rows = [r.__dict__ for r in enhanced_results]
-        self.insert_bigquery_analytics(table_id, rows)
+        if self.bigquery_client:
+            # Snapshot now (downstream agents mutate results in place), then
+            # run the blocking upload in the background
+            batch = self._result_batch(enhanced_results)
+            self.run_in_background(self.load_bigquery_results, table_id, batch, rows=enhanced_dicts)
 
         # Export AI analysis metric to Cloud Monitoring
         self.export_custom_metric(
@@ -253,22 +488,23 @@ class GeminiAnalysisAgent(BaseAgent):
 
     def _group_violations_by_file(self, scan_results: List[ScanResult]) -> Dict[str, List[ScanResult]]:
         """Group violations by file path for efficient AI processing"""
-        grouped = {}
+        grouped = defaultdict(list)
         for result in scan_results:
-            if result.file_path not in grouped:
-                grouped[result.file_path] = []
             grouped[result.file_path].append(result)
-        return grouped
+        return dict(grouped)
     
-    async def _analyze_file_violations(self, file_path: str, violations: List[ScanResult]) -> List[ScanResult]:
-        """Analyze violations in a single file using enhanced Gemini AI"""
-        enhanced_results = []
+    async def _analyze_file_violations(self, file_path: str, violations: List[ScanResult]) -> tuple:
+        """
+        Analyze violations in a single file using enhanced Gemini AI.
         
+        Returns:
+            Tuple of (results for the file, whether Gemini enhanced or added any)
+        """
         try:
             # Read file content for context
-            file_content = self._read_file_content(file_path)
+            file_content = await self._read_file_content(file_path)
             if not file_content:
-                return violations
+                return violations, False
             
             # Prepare enhanced AI prompt
             prompt = self._create_enhanced_ai_prompt(file_path, file_content, violations)
@@ -278,153 +514,138 @@ class GeminiAnalysisAgent(BaseAgent):
                 "file_path": file_path,
                 "violation_count": len(violations),
                 "file_size": len(file_content)
-            })
+            }, system_preamble=FILE_ANALYSIS_PREAMBLE, response_schema=FILE_ANALYSIS_SCHEMA)
             
             if ai_response:
                 # Process AI response and enhance violations
-                enhanced_results = self._process_enhanced_ai_response(violations, ai_response, file_path)
-            else:
-                # Fallback to original violations if AI fails
-                enhanced_results = violations
+                return self._process_enhanced_ai_response(violations, ai_response, file_path)
+            # Fallback to original violations if AI fails
+            return violations, False
             
         except Exception as e:
             self.log_activity(f"Error analyzing {file_path}: {str(e)} - using original violations", "warning")
-            return violations
-        
-        return enhanced_results
+            return violations, False
     
-    def _read_file_content(self, file_path: str) -> Optional[str]:
-        """Read file content for AI context"""
+    async def _read_file_content(self, file_path: str) -> Optional[str]:
+        """Read file content for AI context without blocking the event loop"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                # Limit content to avoid token limits while preserving context
-                return content[:4000] if len(content) > 4000 else content
+            return await asyncio.to_thread(self._read_file_content_sync, file_path)
         except Exception as e:
             self.log_activity(f"Could not read {file_path}: {str(e)}", "warning")
             return None
     
-    def _create_enhanced_ai_prompt(self, file_path: str, file_content: str, violations: List[ScanResult]) -> str:
-        """Create enhanced AI prompt for comprehensive privacy analysis"""
-        violations_text = "\n".join([
-            f"- Line {v.line_number}: {v.violation_type} - {v.description} [Severity: {v.severity}]"
-            for v in violations
-        ])
+    def _read_file_content_sync(self, file_path: str) -> str:
+        """
+        Blocking file read used by _read_file_content (runs in a worker thread).
         
-        prompt = f"""
-You are an expert privacy compliance analyst with deep knowledge of GDPR, CCPA, HIPAA, and other privacy regulations.
-
-File: {file_path}
-Content (first 4000 characters):
-{file_content}
-
-Detected violations:
-{violations_text}
-
-Please provide a comprehensive privacy analysis including:
-
-1. **Enhanced Violation Analysis**: For each detected violation:
-   - Detailed explanation of the privacy risk
-   - Specific regulatory violations (GDPR articles, CCPA sections, etc.)
-   - Business impact assessment
-   - Enhanced fix suggestions with code examples
-   - Related privacy concerns
-
-2. **Additional Violations**: Identify any related privacy issues not yet detected:
-   - Missing consent mechanisms
-   - Data retention violations
-   - Security vulnerabilities
-   - Privacy by design violations
-
-3. **Context Analysis**: How these violations relate to:
-   - Overall application architecture
-   - Data flow patterns
-   - User privacy rights
-   - Compliance requirements
-
-Format your response as JSON:
-{{
-    "enhanced_violations": [
-        {{
-            "line_number": <line>,
-            "enhanced_description": "<detailed explanation with context>",
-            "risk_assessment": "<HIGH/MEDIUM/LOW>",
-            "business_impact": "<specific business consequences>",
-            "enhanced_fix": "<detailed code fix with explanation>",
-            "regulatory_articles": ["<specific GDPR Article X>", "<CCPA Section Y>"],
-            "related_concerns": ["<related privacy issue 1>", "<related privacy issue 2>"],
-            "compliance_priority": "<IMMEDIATE/HIGH/MEDIUM/LOW>"
-        }}
-    ],
-    "additional_violations": [
-        {{
-            "line_number": <line>,
-            "violation_type": "<specific violation type>",
-            "description": "<detailed description>",
-            "severity": "<HIGH/MEDIUM/LOW>",
-            "fix_suggestion": "<specific fix with code>",
-            "regulation_reference": "<specific regulation>",
-            "compliance_impact": "<HIGH/MEDIUM/LOW>"
-        }}
-    ],
-    "context_analysis": {{
-        "overall_risk_level": "<HIGH/MEDIUM/LOW>",
-        "compliance_gaps": ["<gap 1>", "<gap 2>"],
-        "architectural_concerns": ["<concern 1>", "<concern 2>"],
-        "recommendations": ["<recommendation 1>", "<recommendation 2>"]
-    }}
-}}
-
-Focus on actionable insights that help developers understand the full scope of privacy implications and implement effective fixes.
-"""
-        return prompt
+        Contents are memoized per path and reused while the file's mtime and
+        size are unchanged, so files seen again in later batches are not re-read.
+        """
+        st = os.stat(file_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._file_cache_lock:
+            cached = self._file_cache.get(file_path)
+            if cached is not None and cached[0] == stamp:
+                self._file_cache.move_to_end(file_path)
+                return cached[1]
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            # Limit content to avoid token limits while preserving context.
+            # Text-mode read(n) counts characters and the incremental decoder
+            # never splits a multibyte sequence, so the rest of the file is
+            # never loaded.
+            content = f.read(4000)
+        
+        with self._file_cache_lock:
+            self._file_cache[file_path] = (stamp, content)
+            self._file_cache.move_to_end(file_path)
+            while len(self._file_cache) > FILE_CACHE_SIZE:
+                self._file_cache.popitem(last=False)
+        return content
+    
+    def _create_enhanced_ai_prompt(self, file_path: str, file_content: str, violations: List[ScanResult]) -> str:
+        """Create the per-file part of the AI prompt (instructions are in FILE_ANALYSIS_PREAMBLE)"""
+        return _FILE_PROMPT_TEMPLATE.format_map({
+            "file_path": file_path,
+            "file_content": file_content,
+            "violations_text": "\n".join(map(_fmt_violation, violations))
+        })
     
-    def _process_enhanced_ai_response(self, original_violations: List[ScanResult], ai_response: str, file_path: str) -> List[ScanResult]:
-        """Process enhanced AI response and improve violations"""
+    def _process_enhanced_ai_response(self, original_violations: List[ScanResult], ai_response: str, file_path: str) -> tuple:
+        """
+        Process enhanced AI response and improve violations.
+        
+        Enhanced violations are copies, so if the response cannot be fully
+        applied the untouched originals are returned instead of a
+        half-applied result.
+        
+        Returns:
+            Tuple of (enhanced results, whether any violation was enhanced or added)
+        """
         enhanced_results = []
+        any_enhanced = False
         
         try:
             # Try to extract JSON from AI response
-            ai_data = self._extract_json_from_response(ai_response)
+            ai_data = self._extract_violation_sections(ai_response)
             if not ai_data:
                 self.log_activity("Failed to extract valid JSON from AI response - using original violations", "warning")
-                return original_violations
+                return original_violations, False
+            
+            # Index AI enhancements by line number (first entry per line wins)
+            by_line = {}
+            for enhanced in ai_data.get('enhanced_violations', []):
+                try:
+                    by_line.setdefault(int(enhanced.get('line_number')), enhanced)
+                except (TypeError, ValueError):
+                    continue
             
             # Enhance existing violations with AI insights
             for violation in original_violations:
-                enhanced_violation = self._find_enhancement(violation, ai_data.get('enhanced_violations', []))
+                enhanced_violation = by_line.get(violation.line_number)
                 if enhanced_violation:
-                    # Update violation with comprehensive AI insights
-                    violation.description = enhanced_violation.get('enhanced_description', violation.description)
-                    violation.fix_suggestion = enhanced_violation.get('enhanced_fix', violation.fix_suggestion)
+                    # Update a copy of the violation with comprehensive AI insights
+                    description = enhanced_violation.get('enhanced_description', violation.description)
+                    fix_suggestion = enhanced_violation.get('enhanced_fix', violation.fix_suggestion)
                     
                     # Update regulation reference with specific articles
+                    regulation_reference = violation.regulation_reference
                     regulatory_articles = enhanced_violation.get('regulatory_articles', [])
                     if regulatory_articles:
-                        violation.regulation_reference = ', '.join(regulatory_articles)
+                        regulation_reference = ', '.join(regulatory_articles)
                     
                     # Update severity based on AI risk assessment
-                    if enhanced_violation.get('risk_assessment'):
-                        violation.severity = enhanced_violation['risk_assessment']
+                    severity = enhanced_violation.get('risk_assessment') or violation.severity
                     
-                    # Add business impact and related concerns to description
+                    # Add business impact and related concerns to description,
+                    # joining all pieces once instead of appending to the string
                     business_impact = enhanced_violation.get('business_impact', '')
                     related_concerns = enhanced_violation.get('related_concerns', [])
                     if business_impact or related_concerns:
-                        additional_info = []
+                        parts = [description]
                         if business_impact:
-                            additional_info.append(f"Business Impact: {business_impact}")
+                            parts.append(f"Business Impact: {business_impact}")
                         if related_concerns:
-                            additional_info.append(f"Related Concerns: {', '.join(related_concerns)}")
-                        violation.description += f" | {' | '.join(additional_info)}"
+                            parts.append(f"Related Concerns: {', '.join(related_concerns)}")
+                        description = ' | '.join(parts)
+                    
+                    violation = replace(
+                        violation,
+                        description=description,
+                        fix_suggestion=fix_suggestion,
+                        regulation_reference=regulation_reference,
+                        severity=severity
+                    )
+                    any_enhanced = True
                 
                 enhanced_results.append(violation)
             
             # Add new violations found by AI
             for new_violation in ai_data.get('additional_violations', []):
+                any_enhanced = True
                 enhanced_results.append(ScanResult(
                     file_path=file_path,
-                    line_number=new_violation.get('line_number', 0),
+                    line_number=_line_number(new_violation.get('line_number')),
                     violation_type=new_violation.get('violation_type', 'AIEnhancedViolation'),
                     description=new_violation.get('description', 'AI-detected privacy violation'),
                     severity=new_violation.get('severity', 'MEDIUM'),
@@ -436,9 +657,10 @@ Focus on actionable insights that help developers understand the full scope of p
             
         except Exception as e:
             self.log_activity(f"Error processing AI response: {str(e)} - using original violations", "warning")
-            return original_violations
+            # Enhancements were applied to copies, so the originals are untouched
+            return original_violations, False
         
-        return enhanced_results
+        return enhanced_results, any_enhanced
     
     def _extract_json_from_response(self, response: str) -> Optional[Dict[str, Any]]:
         """Extract JSON from AI response, handling various response formats"""
@@ -446,82 +668,74 @@ Focus on actionable insights that help developers understand the full scope of p
             # First, try to parse the response directly as JSON
             return json.loads(response)
         except json.JSONDecodeError:
+            pass
+        
+        # Otherwise decode the first complete JSON object embedded in the text
+        # (e.g. inside a ```json fence). raw_decode parses in a single linear
+        # pass and handles nested braces correctly.
+        idx = response.find('{')
+        while idx != -1:
             try:
-                # Try to find JSON blocks in the response
-                import re
-                json_pattern = r'\{.*\}'
-                matches = re.findall(json_pattern, response, re.DOTALL)
-                
-                for match in matches:
-                    try:
-                        return json.loads(match)
-                    except json.JSONDecodeError:
-                        continue
-                
-                # If no JSON found, return None
-                return None
-            except Exception:
-                return None
+                obj, _ = _JSON_DECODER.raw_decode(response, idx)
+                return obj
+            except json.JSONDecodeError:
+                idx = response.find('{', idx + 1)
+        
+        # If no JSON found, return None
+        return None
 
-    async def _generate_comprehensive_insights(self, original_results: List[ScanResult], enhanced_results: List[ScanResult]) -> Dict[str, Any]:
+    def _extract_violation_sections(self, response: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract the enhanced/additional violation lists from a file analysis response.
+        
+        Large responses are stream-parsed with ijson so only the two violation
+        arrays are materialized; everything else (and any text after the JSON
+        object) is skipped. Falls back to _extract_json_from_response() for
+        small responses, without ijson, or when streaming fails.
+        """
+        if not IJSON_AVAILABLE or len(response) <= STREAM_PARSE_THRESHOLD:
+            return self._extract_json_from_response(response)
+        
+        start = response.find('{')
+        if start == -1:
+            return None
+        sections = {name: [] for name in _VIOLATION_SECTIONS.values()}
+        builder = item_prefix = None
+        try:
+            for prefix, event, value in ijson.parse(response[start:].encode(), use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == item_prefix and event == 'end_map':
+                        sections[_VIOLATION_SECTIONS[item_prefix]].append(builder.value)
+                        builder = None
+                elif event == 'start_map' and prefix in _VIOLATION_SECTIONS:
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    item_prefix = prefix
+                elif prefix == '' and event == 'end_map':
+                    return sections
+        except ijson.JSONError:
+            pass
+        return self._extract_json_from_response(response)
+
+    async def _generate_comprehensive_insights(self, original_results: List[ScanResult], enhanced_results: List[ScanResult],
+                                               type_counts: Optional[Counter] = None) -> Dict[str, Any]:
         """Generate comprehensive AI insights about the privacy analysis"""
         try:
-            prompt = f"""
-You are analyzing the results of a comprehensive privacy compliance scan.
-
-Original violations found: {len(original_results)}
+            if type_counts is None:
+                type_counts = Counter(r.violation_type for r in enhanced_results)
+            prompt = f"""Original violations found: {len(original_results)}
 Enhanced violations after AI analysis: {len(enhanced_results)}
 
 Violation types detected:
-{self._get_violation_type_summary(enhanced_results)}
-
-Please provide comprehensive insights including:
-
-1. **Overall Assessment**: Summary of privacy posture
-2. **Critical Issues**: Most urgent privacy concerns
-3. **Compliance Gaps**: Missing privacy controls
-4. **Risk Prioritization**: Which issues to address first
-5. **Strategic Recommendations**: Long-term privacy improvements
-
-Format as JSON:
-{{
-    "overall_assessment": {{
-        "privacy_posture": "<EXCELLENT/GOOD/FAIR/POOR>",
-        "compliance_status": "<COMPLIANT/PARTIALLY_COMPLIANT/NON_COMPLIANT>",
-        "risk_level": "<HIGH/MEDIUM/LOW>"
-    }},
-    "critical_issues": [
-        {{
-            "issue": "<description>",
-            "impact": "<business/legal/user impact>",
-            "urgency": "<IMMEDIATE/HIGH/MEDIUM>"
-        }}
-    ],
-    "compliance_gaps": [
-        "<specific gap description>"
-    ],
-    "risk_prioritization": [
-        {{
-            "priority": "<1/2/3>",
-            "violation_types": ["<types>"],
-            "rationale": "<why this priority>"
-        }}
-    ],
-    "strategic_recommendations": [
-        {{
-            "recommendation": "<description>",
-            "timeline": "<short/medium/long term>",
-            "impact": "<expected outcome>"
-        }}
-    ]
-}}
+{self._get_violation_type_summary(type_counts)}
 """
             
             ai_response = await self.get_gemini_analysis(prompt, {
                 "original_count": len(original_results),
                 "enhanced_count": len(enhanced_results),
-                "violation_types": list(set([r.violation_type for r in enhanced_results]))
-            })
+                "violation_types": list(type_counts)
+            }, system_preamble=INSIGHTS_PREAMBLE, response_schema=INSIGHTS_SCHEMA)
             
             if ai_response:
                 insights = self._extract_json_from_response(ai_response)
@@ -536,48 +750,60 @@ Format as JSON:
             self.log_activity(f"Error generating comprehensive insights: {str(e)}", "warning")
             return {"error": f"Insights generation failed: {str(e)}"}
 
-    def _get_violation_type_summary(self, results: List[ScanResult]) -> str:
-        """Get summary of violation types for AI analysis"""
-        type_counts = {}
-        for result in results:
-            type_counts[result.violation_type] = type_counts.get(result.violation_type, 0) + 1
+    def _fallback_insights(self, results: List[ScanResult], type_counts: Counter) -> Dict[str, Any]:
+        """Build the insights structure locally when Gemini produced no enhancements"""
+        severities = {r.severity for r in results}
+        if "HIGH" in severities:
+            posture, status, risk_level = "POOR", "NON_COMPLIANT", "HIGH"
+        elif "MEDIUM" in severities:
+            posture, status, risk_level = "FAIR", "PARTIALLY_COMPLIANT", "MEDIUM"
+        elif results:
+            posture, status, risk_level = "GOOD", "PARTIALLY_COMPLIANT", "LOW"
+        else:
+            posture, status, risk_level = "EXCELLENT", "COMPLIANT", "LOW"
         
-        return "\n".join([f"- {vtype}: {count}" for vtype, count in type_counts.items()])
-    
-    def _find_enhancement(self, violation: ScanResult, enhanced_violations: List[Dict]) -> Optional[Dict]:
-        """Find AI enhancement for a specific violation"""
-        for enhanced in enhanced_violations:
-            if enhanced.get('line_number') == violation.line_number:
-                return enhanced
-        return None
+        return {
+            "overall_assessment": {
+                "privacy_posture": posture,
+                "compliance_status": status,
+                "risk_level": risk_level
+            },
+            "critical_issues": [],
+            "compliance_gaps": [],
+            "risk_prioritization": [
+                {
+                    "priority": str(rank),
+                    "violation_types": [vtype],
+                    "rationale": f"{count} occurrence(s) detected"
+                }
+                for rank, (vtype, count) in enumerate(type_counts.most_common(3), start=1)
+            ],
+            "strategic_recommendations": [],
+            "source": "local_summary"
+        }
 
-    def _dict_to_scan_result(self, result_dict: Dict[str, Any]) -> ScanResult:
+    def _get_violation_type_summary(self, type_counts: Counter) -> str:
+        """Get summary of violation types for AI analysis"""
+        return "\n".join(f"- {vtype}: {count}" for vtype, count in type_counts.items())
+
+    def _dict_to_scan_result(self, result_dict: Dict[str, Any], default_timestamp: Optional[datetime] = None) -> ScanResult:
         """Convert dictionary back to ScanResult object"""
+        timestamp = result_dict.get('timestamp')
         return ScanResult(
             file_path=result_dict.get('file_path', ''),
-            line_number=result_dict.get('line_number', 0),
+            line_number=_line_number(result_dict.get('line_number')),
             violation_type=result_dict.get('violation_type', ''),
             description=result_dict.get('description', ''),
             severity=result_dict.get('severity', 'MEDIUM'),
             fix_suggestion=result_dict.get('fix_suggestion', ''),
             regulation_reference=result_dict.get('regulation_reference', ''),
             agent_id=result_dict.get('agent_id', self.agent_id),
-            timestamp=datetime.fromisoformat(result_dict.get('timestamp', datetime.now(UTC).isoformat()))
+            timestamp=datetime.fromisoformat(timestamp) if timestamp else (default_timestamp or datetime.now(UTC))
         )
 
     def _scan_result_to_dict(self, result: ScanResult) -> Dict[str, Any]:
         """Convert ScanResult to dictionary for event publishing"""
-        return {
-            "file_path": result.file_path,
-            "line_number": result.line_number,
-            "violation_type": result.violation_type,
-            "description": result.description,
-            "severity": result.severity,
-            "fix_suggestion": result.fix_suggestion,
-            "regulation_reference": result.regulation_reference,
-            "agent_id": result.agent_id,
-            "timestamp": result.timestamp.isoformat()
-        }
+        return _encode_scan_result(result)
 
     # Cloud Function trigger template (for reference)
     # def cloud_function_entrypoint(request):
@@ -0,0 +1,317 @@
+"""
+Gemini Response Caches - Local Caching for Gemini AI Calls
+==========================================================
+
+This module provides the process-wide caches that sit in front of
+BaseAgent.get_gemini_analysis() so repeated or near-identical prompts are
+answered locally instead of paying a Vertex AI round-trip.
+
+Prompt Cache:
+------------
+- Exact-match cache keyed by a blake2b digest of the full prompt
+- In-memory LRU with a TTL, optionally persisted to SQLite so CI re-scans of
+  unchanged files are answered across runs
+- Checked before the semantic cache since a hit costs a dict lookup
+
+Semantic Cache:
+--------------
+- Prompts are embedded with a small local sentence-transformers model
+- Embeddings and responses are stored in SQLite using the sqlite-vec extension
+- A stored response is reused when the cosine distance to the new prompt is
+  below a threshold and the entry is younger than the TTL
+- Rows are namespaced by agent_id so agents never see each other's answers
+- Only consulted for prompts passed with allow_semantic_cache=True, since the
+  embedding covers just the first 256 word pieces of a prompt
+
+Configuration:
+-------------
+- PG_AI_CACHE: Set to "0" to disable the prompt cache
+- PG_AI_CACHE_TTL: Prompt cache entry lifetime in seconds (default: 3600)
+- PG_AI_CACHE_SIZE: Maximum in-memory prompt cache entries (default: 1024)
+- PG_AI_CACHE_PATH: SQLite database to persist the prompt cache to, e.g. in
+  CI (default: "", in memory only, since responses quote scanned source)
+- PG_SEMANTIC_CACHE: Set to "0" to disable the semantic cache
+- PG_SEMANTIC_CACHE_PATH: SQLite database to persist the semantic cache to
+  (default: "", in memory only, like the prompt cache)
+- PG_SEMANTIC_CACHE_TTL: Entry lifetime in seconds (default: 3600)
+- PG_SEMANTIC_CACHE_DISTANCE: Maximum cosine distance for a hit (default: 0.08)
+
+Dependencies:
+------------
+- sqlite-vec: Vector distance functions for SQLite (optional)
+- sentence-transformers: Local embedding model (optional)
+
+The semantic cache silently disables itself when either optional dependency
+is missing; the prompt cache only needs the standard library.
+
+Author: Privacy Guardian Team
+Built with Google Cloud Agent Development Kit (ADK)
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+try:
+    import sqlite_vec
+    SQLITE_VEC_AVAILABLE = True
+except ImportError:
+    SQLITE_VEC_AVAILABLE = False
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+logger = logging.getLogger("privacy_guardian.gemini_cache")
+
+
+def prompt_key(*parts: Optional[str]) -> str:
+    """Digest identifying a prompt built from one or more text parts."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update((part or "").encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class PromptCache:
+    """
+    Exact-match LRU + TTL cache of Gemini responses keyed by prompt digest.
+    
+    Entries live in an in-memory OrderedDict; when a database path is
+    configured they are also written to SQLite and read back on a memory
+    miss, so responses survive across runs. Safe to call from any thread.
+    """
+    
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: Optional[int] = None,
+                 max_entries: Optional[int] = None):
+        if db_path is None:
+            db_path = os.getenv("PG_AI_CACHE_PATH", "")
+        self.db_path = Path(db_path) if db_path else None
+        self.ttl_seconds = ttl_seconds or int(os.getenv("PG_AI_CACHE_TTL", "3600"))
+        self.max_entries = max_entries or int(os.getenv("PG_AI_CACHE_SIZE", "1024"))
+        self.enabled = os.getenv("PG_AI_CACHE", "1") == "1"
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+    
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the persistent store on first use; disable persistence on failure."""
+        if self._db is None and self.db_path is not None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS prompt_responses ("
+                    "key TEXT PRIMARY KEY, "
+                    "response TEXT NOT NULL, "
+                    "ts INTEGER NOT NULL)"
+                )
+                db.commit()
+                self._db = db
+            except Exception as e:
+                logger.warning(f"Prompt cache persistence disabled: {str(e)}")
+                self.db_path = None
+        return self._db
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a prompt key, or None if missing or expired."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[1] < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    return entry[0]
+                del self._entries[key]
+            
+            db = self._connection()
+            if db is None:
+                return None
+            try:
+                row = db.execute(
+                    "SELECT response, ts FROM prompt_responses WHERE key = ? AND ts >= ?",
+                    (key, int(now) - self.ttl_seconds)
+                ).fetchone()
+            except Exception as e:
+                logger.warning(f"Prompt cache lookup failed: {str(e)}")
+                return None
+            if row is None:
+                return None
+            self._remember(key, row[0], row[1])
+            return row[0]
+    
+    def put(self, key: str, response: str) -> None:
+        """Cache a response under a prompt key."""
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, response, now)
+            db = self._connection()
+            if db is None:
+                return
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO prompt_responses (key, response, ts) VALUES (?, ?, ?)",
+                    (key, response, int(now))
+                )
+                db.execute("DELETE FROM prompt_responses WHERE ts < ?", (int(now) - self.ttl_seconds,))
+                db.commit()
+            except Exception as e:
+                logger.warning(f"Prompt cache store failed: {str(e)}")
+    
+    def _remember(self, key: str, response: str, ts: float) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entries (lock held)."""
+        self._entries[key] = (response, ts)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SemanticCache:
+    """
+    SQLite + sqlite-vec backed semantic cache for Gemini responses.
+
+    The embedding model and database connection are created on first use so
+    that importing this module stays cheap. All public methods are safe to
+    call from worker threads.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: Optional[int] = None,
+                 max_distance: Optional[float] = None):
+        if db_path is None:
+            db_path = os.getenv("PG_SEMANTIC_CACHE_PATH", "")
+        self.db_path = Path(db_path) if db_path else None
+        self.ttl_seconds = ttl_seconds or int(os.getenv("PG_SEMANTIC_CACHE_TTL", "3600"))
+        self.max_distance = max_distance or float(os.getenv("PG_SEMANTIC_CACHE_DISTANCE", "0.08"))
+        self.enabled = SQLITE_VEC_AVAILABLE and os.getenv("PG_SEMANTIC_CACHE", "1") == "1"
+        self._lock = threading.Lock()
+        # Held while the model and database are created, so that happens once
+        self._init_lock = threading.Lock()
+        self._db = None
+        self._embedder = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database (in memory unless a path is set) and load sqlite-vec."""
+        if self.db_path is None:
+            db = sqlite3.connect(":memory:", check_same_thread=False)
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        db.enable_load_extension(True)
+        sqlite_vec.load(db)
+        db.enable_load_extension(False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS gemini_responses ("
+            "agent_id TEXT NOT NULL, "
+            "embedding BLOB NOT NULL, "
+            "response TEXT NOT NULL, "
+            "ts INTEGER NOT NULL)"
+        )
+        db.execute("CREATE INDEX IF NOT EXISTS idx_gemini_responses_agent ON gemini_responses (agent_id, ts)")
+        db.commit()
+        return db
+
+    def _ensure_ready(self) -> bool:
+        """
+        Lazily load the embedding model and database once per process.
+        
+        Concurrent callers wait for the first one to finish; the cache is
+        disabled if either cannot be created.
+        """
+        if not self.enabled:
+            return False
+        if self._db is not None:
+            return True
+        with self._init_lock:
+            if not self.enabled:
+                return False
+            if self._db is not None:
+                return True
+            try:
+                from sentence_transformers import SentenceTransformer
+                embedder = SentenceTransformer(EMBEDDING_MODEL_NAME)
+                db = self._connect()
+            except Exception as e:
+                logger.warning(f"Semantic cache disabled: {str(e)}")
+                self.enabled = False
+                return False
+            # _db is assigned last: readers treat it as "ready"
+            self._embedder = embedder
+            self._db = db
+            return True
+
+    def _embed(self, text: str) -> bytes:
+        """Embed text and serialize it in sqlite-vec's float32 format."""
+        embedding = self._embedder.encode(text, normalize_embeddings=True)
+        return sqlite_vec.serialize_float32(embedding.tolist())
+
+    def lookup(self, agent_id: str, prompt: str) -> tuple:
+        """
+        Find a cached response for a semantically similar prompt.
+
+        Args:
+            agent_id: Namespace of the calling agent
+            prompt: Full prompt about to be sent to Gemini
+
+        Returns:
+            Tuple of (cached response or None, prompt embedding or None).
+            The embedding can be passed to store() to avoid re-encoding.
+        """
+        if not self._ensure_ready():
+            return None, None
+        try:
+            embedding = self._embed(prompt)
+            min_ts = int(time.time()) - self.ttl_seconds
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT response, vec_distance_cosine(embedding, ?) AS distance "
+                    "FROM gemini_responses WHERE agent_id = ? AND ts >= ? "
+                    "ORDER BY distance LIMIT 1",
+                    (embedding, agent_id, min_ts)
+                ).fetchone()
+            if row and row[1] < self.max_distance:
+                return row[0], embedding
+            return None, embedding
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {str(e)}")
+            return None, None
+
+    def store(self, agent_id: str, prompt: str, response: str, embedding: Optional[bytes] = None) -> None:
+        """
+        Store a Gemini response for future semantic lookups.
+
+        Args:
+            agent_id: Namespace of the calling agent
+            prompt: Prompt that produced the response
+            response: Gemini response text
+            embedding: Embedding returned by lookup(), if available
+        """
+        if not self._ensure_ready():
+            return
+        try:
+            if embedding is None:
+                embedding = self._embed(prompt)
+            now = int(time.time())
+            with self._lock:
+                self._db.execute(
+                    "INSERT INTO gemini_responses (agent_id, embedding, response, ts) VALUES (?, ?, ?, ?)",
+                    (agent_id, embedding, response, now)
+                )
+                self._db.execute(
+                    "DELETE FROM gemini_responses WHERE ts < ?",
+                    (now - self.ttl_seconds,)
+                )
+                self._db.commit()
+        except Exception as e:
+            logger.warning(f"Semantic cache store failed: {str(e)}")
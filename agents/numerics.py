@@ -0,0 +1,283 @@
+"""
+Numerics - Compiled Helpers for Scan Result Post-Processing
+===========================================================
+
+This module provides the numeric kernels agents use to post-process large
+lists of ScanResult objects (severity scoring, counting and grouping)
+without looping over Python objects for every operation.
+
+Data Layout:
+-----------
+ScanResultBatch stores a list of results as parallel arrays (structure of arrays):
+- severity: int8 codes from SEVERITY_CODES (-1 for unknown severities)
+- line_number: int32 line numbers
+- violation_type_id: int16 indices into the batch's violation_types table
+- file_path, description, ... : object arrays for free-text columns
+
+Acceleration:
+------------
+- Kernels are compiled with numba.njit(cache=True, nogil=True) when Numba is
+  installed; the LLVM output is cached on disk and reused by later processes
+- Without Numba, equivalent vectorized NumPy implementations are used; both
+  are always defined so test_deployment.py can check them against each other
+
+Usage:
+------
+Agents normally go through the BaseAgent helpers (ComplianceAgent scores
+and groups its results this way):
+
+```python
+scores = self._score_batch(scan_results)
+by_severity = self._group_by_severity(scan_results)
+```
+
+Dependencies:
+------------
+- numpy: Array storage and vectorized fallbacks
+- numba: Optional JIT compilation of the kernels
+- pyarrow: Optional, only for ScanResultBatch.to_arrow()
+
+Author: Privacy Guardian Team
+Built with Google Cloud Agent Development Kit (ADK)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+SEVERITY_LEVELS = ("LOW", "MEDIUM", "HIGH")
+SEVERITY_CODES = {name: code for code, name in enumerate(SEVERITY_LEVELS)}
+UNKNOWN_SEVERITY = -1
+
+# Matches ComplianceAgent's compliance-score weighting (unknown counts as LOW)
+DEFAULT_SEVERITY_WEIGHTS = (1.0, 2.0, 3.0)
+
+
+def encode_severities(severities: Sequence[str]) -> np.ndarray:
+    """Map severity strings to int8 codes (UNKNOWN_SEVERITY if unrecognized)."""
+    get_code = SEVERITY_CODES.get
+    return np.fromiter(
+        (get_code(severity, UNKNOWN_SEVERITY) for severity in severities),
+        dtype=np.int8,
+        count=len(severities)
+    )
+
+
+# Per-row columns of ScanResultBatch; text columns are stored as object arrays
+_TEXT_COLUMNS = ("file_path", "description", "fix_suggestion", "regulation_reference", "agent_id", "timestamp")
+_ARRAY_COLUMNS = _TEXT_COLUMNS + ("line_number", "severity", "violation_type_id")
+
+
+@dataclass
+class ScanResultBatch:
+    """
+    Structure-of-arrays companion to a list of ScanResult objects.
+    
+    Numeric and enum columns live in contiguous NumPy arrays so filters and
+    aggregations run vectorized; free-text columns are object arrays.
+    Severities use SEVERITY_CODES (so ``severity == "HIGH"`` becomes
+    ``batch.severity == SEVERITY_CODES["HIGH"]``) and violation types are
+    indices into ``violation_types``.
+    """
+    file_path: np.ndarray
+    line_number: np.ndarray
+    severity: np.ndarray
+    violation_type_id: np.ndarray
+    violation_types: List[str]
+    description: np.ndarray
+    fix_suggestion: np.ndarray
+    regulation_reference: np.ndarray
+    agent_id: np.ndarray
+    timestamp: np.ndarray
+    
+    @classmethod
+    def from_results(cls, results: Sequence[Any]) -> "ScanResultBatch":
+        """Build a batch from ScanResult objects in a single pass."""
+        count = len(results)
+        columns = {name: np.empty(count, dtype=object) for name in _TEXT_COLUMNS}
+        line_number = np.empty(count, dtype=np.int32)
+        severity = np.empty(count, dtype=np.int8)
+        violation_type_id = np.empty(count, dtype=np.int16)
+        violation_index: Dict[str, int] = {}
+        get_severity = SEVERITY_CODES.get
+        
+        file_path = columns["file_path"]
+        description = columns["description"]
+        fix_suggestion = columns["fix_suggestion"]
+        regulation_reference = columns["regulation_reference"]
+        agent_id = columns["agent_id"]
+        timestamp = columns["timestamp"]
+        for i, result in enumerate(results):
+            file_path[i] = result.file_path
+            line_number[i] = result.line_number
+            severity[i] = get_severity(result.severity, UNKNOWN_SEVERITY)
+            code = violation_index.get(result.violation_type)
+            if code is None:
+                code = violation_index[result.violation_type] = len(violation_index)
+            violation_type_id[i] = code
+            description[i] = result.description
+            fix_suggestion[i] = result.fix_suggestion
+            regulation_reference[i] = result.regulation_reference
+            agent_id[i] = result.agent_id
+            timestamp[i] = result.timestamp
+        
+        return cls(
+            line_number=line_number,
+            severity=severity,
+            violation_type_id=violation_type_id,
+            violation_types=list(violation_index),
+            **columns
+        )
+    
+    def __len__(self) -> int:
+        return self.line_number.shape[0]
+    
+    def severity_mask(self, severity: str) -> np.ndarray:
+        """Boolean mask of rows with the given severity name."""
+        return self.severity == SEVERITY_CODES.get(severity, UNKNOWN_SEVERITY)
+    
+    def violation_mask(self, violation_type: str) -> np.ndarray:
+        """Boolean mask of rows with the given violation type."""
+        if violation_type not in self.violation_types:
+            return np.zeros(len(self), dtype=bool)
+        return self.violation_type_id == self.violation_types.index(violation_type)
+    
+    def select(self, mask: np.ndarray) -> "ScanResultBatch":
+        """New batch containing only the rows selected by a mask or index array."""
+        return ScanResultBatch(
+            violation_types=self.violation_types,
+            **{name: getattr(self, name)[mask] for name in _ARRAY_COLUMNS}
+        )
+    
+    def to_arrow(self):
+        """
+        Convert to a pyarrow.Table with the same columns as ScanResult.
+        
+        Severity and violation type codes are decoded back to strings so the
+        table can be shipped across process boundaries or loaded into
+        BigQuery without the enum tables. Unrecognized severities are
+        reported as "UNKNOWN".
+        """
+        import pyarrow as pa
+        
+        severity_names = np.array(SEVERITY_LEVELS + ("UNKNOWN",), dtype=object)
+        violation_names = np.array(self.violation_types, dtype=object)
+        return pa.table({
+            "file_path": pa.array(self.file_path, type=pa.string()),
+            "line_number": pa.array(self.line_number),
+            "violation_type": pa.array(violation_names[self.violation_type_id], type=pa.string()),
+            "description": pa.array(self.description, type=pa.string()),
+            "severity": pa.array(severity_names[self.severity], type=pa.string()),
+            "fix_suggestion": pa.array(self.fix_suggestion, type=pa.string()),
+            "regulation_reference": pa.array(self.regulation_reference, type=pa.string()),
+            "agent_id": pa.array(self.agent_id, type=pa.string()),
+            "timestamp": pa.array(self.timestamp, type=pa.timestamp("us", tz="UTC")),
+        })
+
+
+# Vectorized NumPy kernels: the fallback without Numba, and the reference
+# the compiled kernels are checked against (see test_deployment.py)
+def _score_severities_numpy(sev_codes, weights):
+    """Weight of each result's severity; unknown severities use the LOW weight."""
+    weights = np.asarray(weights, dtype=np.float32)
+    return np.where(sev_codes >= 0, weights[np.maximum(sev_codes, 0)], weights[0]).astype(np.float32)
+
+
+def _count_severities_numpy(sev_codes, n_levels):
+    """Number of results per severity code (unknown severities are skipped)."""
+    return np.bincount(sev_codes[sev_codes >= 0], minlength=n_levels).astype(np.int64)
+
+
+def _group_by_severity_numpy(sev_codes, n_levels):
+    """
+    Stable counting sort of result indices by severity code.
+
+    Returns (order, offsets): indices of bucket b are
+    order[offsets[b]:offsets[b + 1]], with unknown severities in the
+    final bucket n_levels.
+    """
+    buckets = np.where(sev_codes >= 0, sev_codes, n_levels).astype(np.int64)
+    order = np.argsort(buckets, kind="stable")
+    offsets = np.zeros(n_levels + 2, dtype=np.int64)
+    np.cumsum(np.bincount(buckets, minlength=n_levels + 1), out=offsets[1:])
+    return order, offsets
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _score_severities_numba(sev_codes, weights):
+        """Weight of each result's severity; unknown severities use the LOW weight."""
+        scores = np.empty(sev_codes.shape[0], dtype=np.float32)
+        for i in range(sev_codes.shape[0]):
+            code = sev_codes[i]
+            scores[i] = weights[code] if code >= 0 else weights[0]
+        return scores
+
+    @njit(cache=True, nogil=True)
+    def _count_severities_numba(sev_codes, n_levels):
+        """Number of results per severity code (unknown severities are skipped)."""
+        counts = np.zeros(n_levels, dtype=np.int64)
+        for i in range(sev_codes.shape[0]):
+            code = sev_codes[i]
+            if code >= 0:
+                counts[code] += 1
+        return counts
+
+    @njit(cache=True, nogil=True)
+    def _group_by_severity_numba(sev_codes, n_levels):
+        """
+        Stable counting sort of result indices by severity code.
+
+        Returns (order, offsets): indices of bucket b are
+        order[offsets[b]:offsets[b + 1]], with unknown severities in the
+        final bucket n_levels.
+        """
+        n = sev_codes.shape[0]
+        offsets = np.zeros(n_levels + 2, dtype=np.int64)
+        for i in range(n):
+            code = sev_codes[i]
+            bucket = code if code >= 0 else n_levels
+            offsets[bucket + 1] += 1
+        for b in range(n_levels + 1):
+            offsets[b + 1] += offsets[b]
+        cursor = offsets[:-1].copy()
+        order = np.empty(n, dtype=np.int64)
+        for i in range(n):
+            code = sev_codes[i]
+            bucket = code if code >= 0 else n_levels
+            order[cursor[bucket]] = i
+            cursor[bucket] += 1
+        return order, offsets
+
+    score_severities = _score_severities_numba
+    count_severities = _count_severities_numba
+    group_by_severity = _group_by_severity_numba
+else:
+    score_severities = _score_severities_numpy
+    count_severities = _count_severities_numpy
+    group_by_severity = _group_by_severity_numpy
+
+
+def score_results(results: Sequence[Any], weights: Sequence[float] = DEFAULT_SEVERITY_WEIGHTS) -> np.ndarray:
+    """Severity weight of every result as a float32 array."""
+    codes = encode_severities([result.severity for result in results])
+    return score_severities(codes, np.asarray(weights, dtype=np.float32))
+
+
+def group_results_by_severity(results: Sequence[Any]) -> Dict[str, List[Any]]:
+    """Group results by severity name, preserving their original order."""
+    codes = encode_severities([result.severity for result in results])
+    order, offsets = group_by_severity(codes, len(SEVERITY_LEVELS))
+    grouped: Dict[str, List[Any]] = {}
+    for bucket, name in enumerate(SEVERITY_LEVELS + ("UNKNOWN",)):
+        start, end = offsets[bucket], offsets[bucket + 1]
+        if end > start:
+            grouped[name] = [results[i] for i in order[start:end]]
+    return grouped
@@ -143,11 +143,11 @@ except ImportError as e:
 
 # Handle imports for both module and script execution
 try:
-    from .base_agent import BaseAgent, ScanResult, AgentEvent
+    from .base_agent import BaseAgent, ScanResult, AgentEvent, _json_loads
 except ImportError:
     # When running as script, use absolute import
     sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-    from agents.base_agent import BaseAgent, ScanResult, AgentEvent
+    from agents.base_agent import BaseAgent, ScanResult, AgentEvent, _json_loads
 
 class PrivacyScanAgent(BaseAgent):
     """
@@ -241,7 +241,7 @@ class PrivacyScanAgent(BaseAgent):
         if self.rule_engine:
             try:
                 self.log_activity("Using imported TypeScript RuleEngine")
-                violations = self.rule_engine.run(project_path)
+                violations = await self.rule_engine.run_async(project_path)
                 
                 for violation_string in violations:
                     parsed = self._parse_violation_string(violation_string)
@@ -269,26 +269,8 @@ class PrivacyScanAgent(BaseAgent):
                 )
                 stdout, stderr = await proc.communicate()
                 if proc.returncode == 0:
-                    # Clean the output - remove trailing characters and decode
-                    output = stdout.decode().strip()
-                    # Remove trailing % character if present
-                    if output.endswith('%'):
-                        output = output[:-1]
-                    
-                    # Debug logging
-                    self.log_activity(f"Node.js output length: {len(output)}")
-                    self.log_activity(f"Node.js output first 200 chars: {output[:200]}")
-                    self.log_activity(f"Node.js output last 50 chars: {output[-50:]}")
-                    
-                    # Extract JSON part - find the first { and last }
-                    start_idx = output.find('{')
-                    end_idx = output.rfind('}')
-                    if start_idx != -1 and end_idx != -1:
-                        json_output = output[start_idx:end_idx + 1]
-                        self.log_activity(f"Extracted JSON length: {len(json_output)}")
-                        result = json.loads(json_output)
-                    else:
-                        raise ValueError("No valid JSON found in output")
+                    # The CLI writes only the JSON result to stdout (logging goes to stderr)
+                    result = _json_loads(stdout)
                     
                     for v in result.get("violations", []):
                         # Parse violation string: [LANG] path:line - description (found: "match")
@@ -315,8 +297,7 @@ class PrivacyScanAgent(BaseAgent):
         # --- Google Cloud Integrations ---
         # Insert scan analytics into BigQuery
         table_id = f"{os.getenv('GOOGLE_CLOUD_PROJECT')}.privacy.scan_results"
-        rows = [s.__dict__ for s in scan_results]
-        self.insert_bigquery_analytics(table_id, rows)
+        self.insert_bigquery_analytics(table_id, scan_results)
 
         # Export scan metric to Cloud Monitoring
         self.export_custom_metric(
@@ -645,7 +626,7 @@ class PrivacyScanAgent(BaseAgent):
         status.update({
             "rule_engine_available": self.rule_engine is not None,
             "supported_extensions": list(self.supported_extensions),
-            "total_violations_detected": len(self.events_published)
+            "total_violations_detected": self._events_published_total
         })
         return status
 
@@ -3,9 +3,33 @@
 // rule_engine_cli.js
 // Node.js CLI wrapper for Privacy Guardian Agents RuleEngine
 // Usage: node rule_engine_cli.js <project_path>
+//        node rule_engine_cli.js --serve [--msgpack]
+//
+// In --serve mode the process stays alive and reads one JSON request per line
+// from stdin ({"paths": ["..."]}), answering each with one JSON line on stdout
+// ({"results": {"<path>": {"violations": [...]} or {"error": "..."}}}). The
+// paths of a request are scanned in order with the same engine instance.
+// A single-path request ({"project_path": "..."}) is answered with
+// {"violations": [...]} or {"error": "..."}. Requests are handled in order.
+//
+// With --msgpack (requires the optional @msgpack/msgpack package), the same
+// requests and responses are msgpack payloads instead of JSON lines, each
+// preceded by a 4-byte little-endian length.
+//
+// In all modes stdout carries only results: console logging and the progress
+// banners some rules write to process.stdout are redirected to stderr.
 
 const path = require('path');
 const fs = require('fs');
+const readline = require('readline');
+const util = require('util');
+
+const writeResult = process.stdout.write.bind(process.stdout);
+const toStderr = (...args) => process.stderr.write(util.format(...args) + '\n');
+process.stdout.write = process.stderr.write.bind(process.stderr);
+console.log = toStderr;
+console.info = toStderr;
+console.warn = toStderr;
 
 // Register ts-node to run TypeScript directly
 require('ts-node').register({
@@ -27,9 +51,7 @@ const { KotlinScanner } = require('./src/scanners/KotlinScanner');
 const { RustScanner } = require('./src/scanners/RustScanner');
 const { ScalaScanner } = require('./src/scanners/ScalaScanner');
 
-async function main() {
-  const projectPath = process.argv[2] || '.';
-
+function createEngine() {
   // Instantiate all language scanners
   const scanners = [
     new JavaScriptScanner(),
@@ -46,12 +68,110 @@ async function main() {
     new ScalaScanner(),
   ];
 
-  const engine = new RuleEngine(scanners);
+  return new RuleEngine(scanners);
+}
+
+async function scanOne(engine, projectPath) {
+  try {
+    const violations = await engine.run(projectPath);
+    return { violations };
+  } catch (err) {
+    return { error: err.message || String(err) };
+  }
+}
+
+async function scan(engine, request) {
+  if (Array.isArray(request.paths)) {
+    const results = {};
+    for (const projectPath of request.paths) {
+      results[projectPath] = await scanOne(engine, projectPath);
+    }
+    return { results };
+  }
+  return scanOne(engine, request.project_path || '.');
+}
+
+function serveLines(engine) {
+  const rl = readline.createInterface({ input: process.stdin, terminal: false });
+  let pending = Promise.resolve();
+
+  rl.on('line', (line) => {
+    if (!line.trim()) {
+      return;
+    }
+    pending = pending.then(async () => {
+      let response;
+      try {
+        response = await scan(engine, JSON.parse(line));
+      } catch (err) {
+        response = { error: err.message || String(err) };
+      }
+      writeResult(JSON.stringify(response) + '\n');
+    });
+  });
+  rl.on('close', () => {
+    pending.then(() => process.exit(0));
+  });
+}
+
+function serveFrames(engine, msgpack) {
+  let buffered = Buffer.alloc(0);
+  let pending = Promise.resolve();
+
+  const writeFrame = (response) => {
+    const payload = Buffer.from(msgpack.encode(response));
+    const header = Buffer.alloc(4);
+    header.writeUInt32LE(payload.length, 0);
+    writeResult(Buffer.concat([header, payload]));
+  };
+
+  process.stdin.on('data', (chunk) => {
+    buffered = buffered.length ? Buffer.concat([buffered, chunk]) : chunk;
+    while (buffered.length >= 4) {
+      const length = buffered.readUInt32LE(0);
+      if (buffered.length < 4 + length) {
+        break;
+      }
+      const frame = buffered.subarray(4, 4 + length);
+      buffered = buffered.subarray(4 + length);
+      pending = pending.then(async () => {
+        let response;
+        try {
+          response = await scan(engine, msgpack.decode(frame));
+        } catch (err) {
+          response = { error: err.message || String(err) };
+        }
+        writeFrame(response);
+      });
+    }
+  });
+  process.stdin.on('end', () => {
+    pending.then(() => process.exit(0));
+  });
+}
+
+function serve(useMsgpack) {
+  const engine = createEngine();
+  if (useMsgpack) {
+    serveFrames(engine, require('@msgpack/msgpack'));
+  } else {
+    serveLines(engine);
+  }
+}
+
+async function main() {
+  if (process.argv[2] === '--serve') {
+    serve(process.argv.includes('--msgpack'));
+    return;
+  }
+
+  const projectPath = process.argv[2] || '.';
+  const engine = createEngine();
 
   try {
     const violations = await engine.run(projectPath);
     // Output as JSON array of violation strings
-    process.stdout.write(JSON.stringify({ violations }));
+    writeResult(JSON.stringify({ violations }) + '\n');
   } catch (err) {
     process.stderr.write(JSON.stringify({ error: err.message || String(err) }));
     process.exit(1);
@@ -7,29 +7,48 @@ import os
 import sys
 import asyncio
 import json
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+AGENT_MODULES = {
+    "PrivacyScanAgent": "agents.privacy_scan_agent",
+    "GeminiAnalysisAgent": "agents.gemini_analysis_agent",
+    "ComplianceAgent": "agents.compliance_agent",
+    "FixSuggestionAgent": "agents.fix_suggestion_agent",
+    "ReportAgent": "agents.report_agent",
+}
+
+@lru_cache(maxsize=None)
+def _agent_class(name):
+    """Agent class, imported once and shared by the tests"""
+    return getattr(importlib.import_module(AGENT_MODULES[name]), name)
+
+@lru_cache(maxsize=None)
+def _google_cloud(name):
+    """google.cloud sub-package, imported once and shared by the tests"""
+    return importlib.import_module(f"google.cloud.{name}")
+
 def test_imports():
     """Test that all required modules can be imported"""
     print("🔍 Testing imports...")
     
     try:
         from agents.base_agent import BaseAgent
-        from agents.privacy_scan_agent import PrivacyScanAgent
-        from agents.gemini_analysis_agent import GeminiAnalysisAgent
-        from agents.compliance_agent import ComplianceAgent
-        from agents.fix_suggestion_agent import FixSuggestionAgent
-        from agents.report_agent import ReportAgent
+        for name in AGENT_MODULES:
+            _agent_class(name)
         print("✅ All agent imports successful")
     except ImportError as e:
         print(f"❌ Import error: {e}")
         return False
     
     try:
-        from google.cloud import storage, bigquery, secretmanager, logging, monitoring_v3
+        for name in ("storage", "bigquery", "secretmanager", "logging", "monitoring_v3"):
+            _google_cloud(name)
         print("✅ All Google Cloud imports successful")
     except ImportError as e:
         print(f"❌ Google Cloud import error: {e}")
@@ -64,29 +83,30 @@ def test_google_cloud_services():
     """Test Google Cloud service connectivity"""
     print("\n☁️ Testing Google Cloud services...")
     
-    try:
-        from google.cloud import storage
-        client = storage.Client()
-        print("✅ Cloud Storage client initialized")
-    except Exception as e:
-        print(f"❌ Cloud Storage error: {e}")
-        return False
+    def storage_client():
+        return _google_cloud("storage").Client()
     
-    try:
-        from google.cloud import bigquery
-        client = bigquery.Client()
-        print("✅ BigQuery client initialized")
-    except Exception as e:
-        print(f"❌ BigQuery error: {e}")
-        return False
+    def bigquery_client():
+        return _google_cloud("bigquery").Client()
     
-    try:
-        from google.cloud import secretmanager
-        client = secretmanager.SecretManagerServiceClient()
-        print("✅ Secret Manager client initialized")
-    except Exception as e:
-        print(f"❌ Secret Manager error: {e}")
-        return False
+    def secret_manager_client():
+        return _google_cloud("secretmanager").SecretManagerServiceClient()
+    
+    # Each client does its own credential discovery, so initialize them side by side
+    clients = [
+        ("Cloud Storage", storage_client),
+        ("BigQuery", bigquery_client),
+        ("Secret Manager", secret_manager_client),
+    ]
+    with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+        futures = [(name, executor.submit(factory)) for name, factory in clients]
+        for name, future in futures:
+            try:
+                future.result()
+                print(f"✅ {name} client initialized")
+            except Exception as e:
+                print(f"❌ {name} error: {e}")
+                return False
     
     return True
 
@@ -95,19 +115,7 @@ async def test_agent_creation():
     print("\n🤖 Testing agent creation...")
     
     try:
-        from agents.privacy_scan_agent import PrivacyScanAgent
-        from agents.gemini_analysis_agent import GeminiAnalysisAgent
-        from agents.compliance_agent import ComplianceAgent
-        from agents.fix_suggestion_agent import FixSuggestionAgent
-        from agents.report_agent import ReportAgent
-        
-        agents = [
-            PrivacyScanAgent(),
-            GeminiAnalysisAgent(),
-            ComplianceAgent(),
-            FixSuggestionAgent(),
-            ReportAgent()
-        ]
+        agents = [_agent_class(name)() for name in AGENT_MODULES]
         
         for agent in agents:
             status = agent.get_agent_status()
@@ -136,6 +144,49 @@ def test_rule_engine():
         print(f"❌ RuleEngine error: {e}")
         return False
 
+def test_numerics():
+    """Test that the severity kernels (Numba and NumPy) agree with a plain-Python reference"""
+    print("\n🧮 Testing numeric kernels...")
+    
+    try:
+        import numpy as np
+        from agents import numerics
+    except ImportError as e:
+        print(f"❌ Numerics import error: {e}")
+        return False
+    
+    n_levels = len(numerics.SEVERITY_LEVELS)
+    weights = np.asarray(numerics.DEFAULT_SEVERITY_WEIGHTS, dtype=np.float32)
+    implementations = {"NumPy": "numpy"}
+    if numerics.NUMBA_AVAILABLE:
+        implementations["Numba"] = "numba"
+    
+    rng = np.random.default_rng(0)
+    for size in (0, 1, 10_000):
+        # Includes UNKNOWN_SEVERITY (-1) codes
+        codes = rng.integers(-1, n_levels, size=size).astype(np.int8)
+        buckets = [int(code) if code >= 0 else n_levels for code in codes]
+        expected_scores = [weights[code] if code >= 0 else weights[0] for code in codes]
+        expected_counts = [buckets.count(level) for level in range(n_levels)]
+        expected_order = sorted(range(size), key=buckets.__getitem__)
+        
+        for label, suffix in implementations.items():
+            scores = getattr(numerics, f"_score_severities_{suffix}")(codes, weights)
+            counts = getattr(numerics, f"_count_severities_{suffix}")(codes, n_levels)
+            order, offsets = getattr(numerics, f"_group_by_severity_{suffix}")(codes, n_levels)
+            if scores.tolist() != expected_scores or counts.tolist() != expected_counts:
+                print(f"❌ {label} severity scores/counts differ from the reference ({size} results)")
+                return False
+            if order.tolist() != expected_order or offsets[-1] != size:
+                print(f"❌ {label} severity grouping differs from the reference ({size} results)")
+                return False
+    
+    checked = " and ".join(implementations)
+    if not numerics.NUMBA_AVAILABLE:
+        print("⚠️ Numba not installed - only the NumPy kernels were checked")
+    print(f"✅ {checked} severity kernels match the reference")
+    return True
+
 def test_web_server():
     """Test web server startup"""
     print("\n🌐 Testing web server...")
@@ -179,7 +230,7 @@ async def test_full_scan():
     print("\n🔍 Testing full privacy scan...")
     
     try:
-        from agents.privacy_scan_agent import PrivacyScanAgent
+        PrivacyScanAgent = _agent_class("PrivacyScanAgent")
         
         # Create test project
         test_dir = create_test_project()
@@ -202,32 +253,50 @@ async def test_full_scan():
         print(f"❌ Full scan error: {e}")
         return False
 
+async def _run_test(test_name, test_func):
+    """Run one test, sync tests in a worker thread, and report whether it passed"""
+    try:
+        if asyncio.iscoroutinefunction(test_func):
+            passed = await test_func()
+        else:
+            passed = await asyncio.get_running_loop().run_in_executor(None, test_func)
+    except Exception as e:
+        print(f"❌ {test_name} test error: {e}")
+        return False
+    
+    if not passed:
+        print(f"❌ {test_name} test failed")
+    return bool(passed)
+
+async def _run_in_order(tests):
+    """Run dependent tests one after another"""
+    return [await _run_test(test_name, test_func) for test_name, test_func in tests]
+
+async def run_tests():
+    """Run the imports check, then all independent tests concurrently"""
+    # Importing first warms sys.modules so the concurrent tests don't race on module imports
+    results = [await _run_test("Imports", test_imports)]
+    
+    groups = [
+        [("Environment", test_environment), ("Google Cloud Services", test_google_cloud_services)],
+        [("Agent Creation", test_agent_creation)],
+        [("RuleEngine", test_rule_engine)],
+        [("Numerics", test_numerics)],
+        [("Web Server", test_web_server)],
+        [("Full Scan", test_full_scan)],
+    ]
+    for group_results in await asyncio.gather(*(_run_in_order(group) for group in groups)):
+        results.extend(group_results)
+    return results
+
 def main():
     """Run all tests"""
     print("🚀 Privacy Guardian Agents - Deployment Test")
     print("=" * 50)
     
-    tests = [
-        ("Imports", test_imports),
-        ("Environment", test_environment),
-        ("Google Cloud Services", test_google_cloud_services),
-        ("Agent Creation", lambda: asyncio.run(test_agent_creation())),
-        ("RuleEngine", test_rule_engine),
-        ("Web Server", test_web_server),
-        ("Full Scan", lambda: asyncio.run(test_full_scan())),
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-            else:
-                print(f"❌ {test_name} test failed")
-        except Exception as e:
-            print(f"❌ {test_name} test error: {e}")
+    results = asyncio.run(run_tests())
+    passed = sum(results)
+    total = len(results)
     
     print("\n" + "=" * 50)
     print(f"📊 Test Results: {passed}/{total} tests passed")
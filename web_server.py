@@ -25,6 +25,22 @@ import tempfile
 
 from agent_orchestrator import PrivacyGuardianOrchestrator
 
+# Scan results and event histories can hold thousands of violations. With
+# orjson they are serialized in C straight from the stored dicts, skipping
+# FastAPI's per-value jsonable_encoder walk.
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_response(content: Any):
+    """Return large JSON payloads via orjson when available."""
+    if ORJSON_AVAILABLE:
+        return ORJSONResponse(content)
+    return content
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Privacy Guardian Agents",
@@ -684,11 +700,11 @@ async def get_scan_status(correlation_id: str):
     session = scan_sessions[correlation_id]
     
     if session["status"] == "completed":
-        return {
+        return _json_response({
             "status": "completed",
             "progress": 1.0,
             "results": session.get("results", {})
-        }
+        })
     elif session["status"] == "failed":
         return {
             "status": "failed",
@@ -709,7 +725,7 @@ async def get_agent_status():
 async def get_event_history(correlation_id: str):
     """Get event history for a specific scan"""
     events = orchestrator.get_event_history(correlation_id)
-    return {"events": events}
+    return _json_response({"events": events})
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file